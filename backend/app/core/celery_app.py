@@ -2,6 +2,7 @@
 import logging
 import platform
 import ssl
+import app.core.inference  # noqa: F401  (sizes the torch thread pools before any model import)
 from celery import Celery
 from app.core.config import settings
 
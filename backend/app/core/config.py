@@ -95,6 +95,8 @@ class PerformanceSettings(BaseSettings):
     MAX_WORKERS: int = Field(default=4)
     ENABLE_ASYNC_PROCESSING: bool = Field(default=True)
     CONCURRENT_REQUESTS: int = Field(default=5)
+    # Torch threads per process; unset splits the CPUs across WEB_CONCURRENCY workers
+    INFERENCE_THREADS: Optional[int] = Field(default=None)
     
     # Summarization specific
     SUMMARIZATION_ASYNC_THRESHOLD_WORDS: int = Field(default=2000)
@@ -243,6 +245,12 @@ class Settings(BaseSettings):
     RATE_LIMIT_REQUESTS: int = Field(default=100)
     RATE_LIMIT_WINDOW: int = Field(default=60)
     
+    # OpenAI request limits. Concurrency is per process; the per-minute budgets are the
+    # account's limits, split across WEB_CONCURRENCY workers, and unset leaves them unpaced
+    OPENAI_MAX_CONCURRENT: int = Field(default=8)
+    OPENAI_REQUESTS_PER_MINUTE: Optional[int] = Field(default=None)
+    OPENAI_TOKENS_PER_MINUTE: Optional[int] = Field(default=None)
+    
     # Caching
     ENABLE_CACHING: bool = Field(default=True)
     CACHE_TTL: int = Field(default=300)
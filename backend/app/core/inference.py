@@ -0,0 +1,38 @@
+"""CPU thread budget for in-process model inference.
+
+Import this before anything that imports torch: the OpenMP/MKL pools read their
+size from the environment when torch first loads.
+"""
+import os
+
+from app.core.config import settings
+
+
+def worker_processes() -> int:
+    """Processes on this machine that run inference side by side"""
+    # Celery workers export CELERY_CONCURRENCY, their prefork child count; uvicorn
+    # and gunicorn both take their worker count from WEB_CONCURRENCY
+    return int(os.environ.get("CELERY_CONCURRENCY") or os.environ.get("WEB_CONCURRENCY") or 1)
+
+
+def inference_threads() -> int:
+    """Threads one process may use for inference, splitting the CPUs across server workers"""
+    configured = settings.PERFORMANCE.INFERENCE_THREADS
+    if configured:
+        return configured
+    return max(1, (os.cpu_count() or 1) // max(1, worker_processes()))
+
+
+INFERENCE_THREADS = inference_threads()
+for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(variable, str(INFERENCE_THREADS))
+
+import torch  # noqa: E402  (after the environment above)
+
+torch.set_num_threads(INFERENCE_THREADS)
+try:
+    # Requests already run concurrently; inter-op parallelism would only oversubscribe
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # Already fixed if inter-op work ran before this import
+    pass
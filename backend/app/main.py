@@ -2,12 +2,16 @@
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
+import app.core.inference  # noqa: F401  (sizes the torch thread pools before any model import)
 from app.services.model_preloader import model_preloader
+from app.services.demo_service import demo_service
 from app.core.config import settings
 from app.database.mongo import connect_to_mongo, close_mongo_connection
 from app.core.exceptions import (
@@ -48,6 +52,11 @@ async def lifespan(app: FastAPI):
         logger.info("All AI models initialized successfully at startup.")
     except Exception as e:
         logger.error(f"Failed to initialize AI models at startup: {e}")
+
+    try:
+        await asyncio.to_thread(demo_service.warmup)
+    except Exception as e:
+        logger.warning(f"Demo sample warmup failed: {e}")
     
     yield
 
@@ -63,6 +72,8 @@ app = FastAPI(
     docs_url="/docs" if settings.ENV != "production" else None,
     redoc_url=None,
     lifespan=lifespan,
+    # orjson encodes the large analysis and list payloads in C
+    default_response_class=ORJSONResponse,
 )
 
 # Configure logging
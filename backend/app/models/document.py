@@ -3,6 +3,7 @@ from pydantic import Field
 from typing import Any, Dict, Optional, List
 from datetime import datetime,timezone
 from beanie import PydanticObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from app.schemas.ai_extraction import ExpiryExtractionResponse
 
 class AcceptedDocument(Document):
@@ -51,10 +52,17 @@ class AcceptedDocument(Document):
     contract_validation: Optional[Dict[str, Any]] = Field(default=None)  # Contract validation metadata
 
     processing_task_id: Optional[str] = None  # Celery task ID for processing
+    content_hash: Optional[str] = None  # blake2b digest of the uploaded file, for duplicate detection
 
 
     class Settings:
         name = "documents"
+        indexes = [
+            # Per-user listings, newest first
+            IndexModel([("user_id", ASCENDING), ("upload_date", DESCENDING)]),
+            # Duplicate-upload lookup
+            IndexModel([("user_id", ASCENDING), ("content_hash", ASCENDING)])
+        ]
 
     class Config:
         populate_by_name = True
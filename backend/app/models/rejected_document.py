@@ -1,7 +1,8 @@
 from beanie import Document
-from pydantic import Field
+from pydantic import Field, model_validator
 from datetime import datetime
 from beanie import PydanticObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from typing import Optional, Dict, Any
 
 
@@ -14,9 +15,22 @@ class RejectedDocument(Document):
     reviewed: bool = False
     upload_date: datetime = Field(default_factory=datetime.utcnow)
     validation_details: Optional[Dict[str, Any]] = Field(default=None)
+    # Derived from reason so stats can filter on an indexed flag instead of a regex
+    is_validation_rejection: bool = False
 
     class Settings:
         name = "rejected_documents"
+        indexes = [
+            # Per-user listings, newest first
+            IndexModel([("user_id", ASCENDING), ("upload_date", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("is_validation_rejection", ASCENDING)])
+        ]
+
+    @model_validator(mode="after")
+    def flag_validation_rejection(self):
+        """Mark rejections caused by the contract validator"""
+        self.is_validation_rejection = "invalid legal contract" in self.reason.lower()
+        return self
 
     class Config:
         populate_by_name = True
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, UploadFile, File, Depends, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from typing import Optional
 import logging
@@ -127,6 +128,31 @@ async def upload_document(
                         "timestamp": result.get("upload_date")
                     }
                 )
+            elif result.get("duplicate") and "document_id" in result:
+                # The same file was already uploaded; nothing new to validate or process
+                document_id = result["document_id"]
+                logger.info(f"Duplicate upload of document {document_id}, skipping processing")
+                upload_date = result.get("upload_date")
+                if isinstance(upload_date, datetime):
+                    upload_date = upload_date.isoformat()
+
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "success": True,
+                        "message": f"Document '{file.filename}' was already uploaded",
+                        "data": {
+                            "document_id": document_id,
+                            "id": document_id,
+                            "filename": result.get("filename", file.filename),
+                            "status": result.get("status"),
+                            "upload_date": upload_date,
+                            "contract_validation": jsonable_encoder(result.get("contract_validation", {})),
+                            "duplicate": True
+                        },
+                        "request_id": getattr(request.state, 'request_id', None)
+                    }
+                )
             elif result.get("needs_background_processing") and "document_id" in result:
                 # Document was accepted and needs background processing
                 document_id = result["document_id"]
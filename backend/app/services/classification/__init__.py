@@ -117,7 +117,7 @@ async def classify_document(content: str, filename: str = "unknown") -> Dict[str
     }
     
     # Early validation
-    if not content or not content.strip():
+    if not content or content.isspace():
         logger.warning(f"[CLASSIFICATION] Empty content for {filename}")
         result.update({
             "classification_method": "empty_content",
@@ -125,7 +125,7 @@ async def classify_document(content: str, filename: str = "unknown") -> Dict[str
         })
         return result
     
-    if len(content.strip()) < 50:
+    if len(content) < 50 and len(content.strip()) < 50:
         logger.warning(f"[CLASSIFICATION] Content too short for {filename}: {len(content)} chars")
         result.update({
             "classification_method": "content_too_short", 
@@ -1,4 +1,5 @@
-from typing import Dict
+from typing import Dict, Optional
+from .document_view import DocumentView
 
 class ComplexityAnalyzer:
     def __init__(self):
@@ -7,19 +8,21 @@ class ComplexityAnalyzer:
             'pursuant', 'notwithstanding', 'hereby', 'herewith'
         ]
 
-    def analyze_complexity(self, content: str) -> Dict:
+    def analyze_complexity(self, content: str, view: Optional[DocumentView] = None) -> Dict:
         """Calculate document complexity metrics"""
-        sentences = content.split('.')
-        words = content.split()
+        if view is None:
+            view = DocumentView(content)
+        words = view.words
+        sentence_count = view.sentence_count
         
         if not words:
             return {"complexity_score": 0.0, "readability_score": 0.0}
         
-        avg_sentence_length = len(words) / max(len(sentences), 1)
-        unique_words = len(set(word.lower().strip('.,!?";:()[]') for word in words))
+        avg_sentence_length = len(words) / max(sentence_count, 1)
+        unique_words = len(set(word.strip('.,!?";:()[]') for word in words))
         vocabulary_richness = unique_words / len(words) if words else 0
         
-        legal_jargon_count = sum(1 for word in self.legal_jargon if word in content.lower())
+        legal_jargon_count = sum(1 for word in self.legal_jargon if word in view.lower)
         
         complexity_score = min(
             (avg_sentence_length / 20) * 0.4 +
@@ -34,5 +37,5 @@ class ComplexityAnalyzer:
             "vocabulary_richness": round(vocabulary_richness, 3),
             "legal_jargon_count": legal_jargon_count,
             "total_words": len(words),
-            "total_sentences": len(sentences)
+            "total_sentences": sentence_count
         }
\ No newline at end of file
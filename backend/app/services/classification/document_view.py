@@ -0,0 +1,19 @@
+import re
+from typing import FrozenSet, List
+
+WORD_RE = re.compile(r'[a-z]+')
+
+
+class DocumentView:
+    """Text views of one document, computed once and shared by the analyzers"""
+
+    def __init__(self, content: str):
+        self.raw = content
+        self.lower = content.lower()
+        # Alphabetic tokens used for whole-word keyword matching
+        self.tokens: FrozenSet[str] = frozenset(WORD_RE.findall(self.lower))
+        # Lowercased whitespace-separated words
+        self.words: List[str] = self.lower.split()
+        self.word_count = len(self.words)
+        # Same count as len(content.split('.')) without building the list
+        self.sentence_count = content.count('.') + 1
@@ -1,5 +1,99 @@
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+import numpy as np
 from .config import DOCUMENT_TYPES, URGENCY_KEYWORDS, LEGAL_DOMAINS
+from .document_view import DocumentView, WORD_RE
+
+CATEGORY_MAPPINGS = (
+    ("document_types", DOCUMENT_TYPES),
+    ("legal_domains", LEGAL_DOMAINS),
+    ("urgency_levels", URGENCY_KEYWORDS),
+)
+
+def _split_keywords(keywords) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """Separate single words (matched as whole tokens) from multi-word phrases"""
+    lowered = [k.lower() for k in keywords]
+    words = frozenset(k for k in lowered if WORD_RE.fullmatch(k))
+    phrases = tuple(k for k in lowered if k not in words)
+    return words, phrases
+
+
+# Per category and label, built once at import: whole-word keywords as a
+# frozenset for C-level intersection, plus the few phrases kept as substrings
+KEYWORD_SETS: Dict[str, Dict[str, Tuple[FrozenSet[str], Tuple[str, ...]]]] = {
+    category: {label: _split_keywords(keywords) for label, keywords in mapping.items()}
+    for category, mapping in CATEGORY_MAPPINGS
+}
+
+ALL_CATEGORIES = tuple(category for category, _ in CATEGORY_MAPPINGS)
+# Subset used when the model already supplied the document type
+DOMAIN_URGENCY_CATEGORIES = ("legal_domains", "urgency_levels")
+
+
+def _label_hits(tokens: FrozenSet[str], text: str, category: str):
+    """Yield (label, hit count) for every label of a category"""
+    for label, (words, phrases) in KEYWORD_SETS[category].items():
+        yield label, len(words & tokens) + sum(1 for phrase in phrases if phrase in text)
+
+
+def count_keyword_hits(text: str, categories: Tuple[str, ...] = ALL_CATEGORIES,
+                       tokens: Optional[FrozenSet[str]] = None) -> Dict[str, Dict[str, int]]:
+    """Count matching keywords per label for each requested category"""
+    if tokens is None:
+        tokens = frozenset(WORD_RE.findall(text))
+    return {
+        category: {label: score for label, score in _label_hits(tokens, text, category) if score > 0}
+        for category in categories
+    }
+
+
+def _score(scores: Dict[str, int], default: str, denom: float) -> Tuple[str, float]:
+    """Pick the best label from keyword hit counts and scale its confidence"""
+    if not scores:
+        return default, 0.0
+    best_label = max(scores, key=scores.__getitem__)
+    return best_label, min(scores[best_label] / denom, 1.0)
+
+
+def _best_label(tokens: FrozenSet[str], text: str, category: str, default: str, denom: float) -> Tuple[str, float]:
+    """Same choice as _score, tracking the running max instead of building a dict"""
+    best_label, best_score = default, 0
+    for label, score in _label_hits(tokens, text, category):
+        if score > best_score:
+            best_label, best_score = label, score
+    return best_label, min(best_score / denom, 1.0)
+
+
+def _build_batch_tables():
+    """Lay every keyword out as one row of a keyword x document hit matrix
+
+    Returns the rows for each whole word, the (phrase, row) pairs, and per
+    category its labels, row range and a label x row membership matrix.
+    """
+    word_rows: Dict[str, List[int]] = {}
+    phrase_rows: List[Tuple[str, int]] = []
+    categories = {}
+    row = 0
+    for category in ALL_CATEGORIES:
+        labels = KEYWORD_SETS[category]
+        start = row
+        row_labels = []
+        for label_idx, (words, phrases) in enumerate(labels.values()):
+            for word in sorted(words):
+                word_rows.setdefault(word, []).append(row)
+                row_labels.append(label_idx)
+                row += 1
+            for phrase in phrases:
+                phrase_rows.append((phrase, row))
+                row_labels.append(label_idx)
+                row += 1
+        membership = np.zeros((len(labels), row - start), dtype=np.int32)
+        membership[row_labels, np.arange(row - start)] = 1
+        categories[category] = (tuple(labels), start, row, membership)
+    return word_rows, phrase_rows, categories, row
+
+
+BATCH_WORD_ROWS, BATCH_PHRASE_ROWS, BATCH_CATEGORIES, BATCH_ROW_COUNT = _build_batch_tables()
+
 
 class RuleBasedClassifier:
     def __init__(self):
@@ -7,48 +101,46 @@ class RuleBasedClassifier:
         self.urgency_keywords = URGENCY_KEYWORDS
         self.legal_domains = LEGAL_DOMAINS
 
-    def classify(self, content: str, filename: str = "") -> Dict[str, Any]:
-        """Rule-based classification"""
-        text = (content + " " + filename).lower()
-
-        # Document type
-        doc_type_scores = {}
-        for doc_type, keywords in self.document_types.items():
-            score = sum(1 for k in keywords if k in text)
-            if score > 0:
-                doc_type_scores[doc_type] = score
-
-        best_doc_type = "general"
-        doc_confidence = 0.0
-        if doc_type_scores:
-            best_doc_type = max(doc_type_scores.items(), key=lambda x: x[1])[0]
-            doc_confidence = min(max(doc_type_scores.values()) / 3.0, 1.0)
-
-        # Legal domain
-        domain_scores = {}
-        for domain, keywords in self.legal_domains.items():
-            score = sum(1 for k in keywords if k in text)
-            if score > 0:
-                domain_scores[domain] = score
-
-        best_domain = "general"
-        domain_confidence = 0.0
-        if domain_scores:
-            best_domain = max(domain_scores.items(), key=lambda x: x[1])[0]
-            domain_confidence = min(max(domain_scores.values()) / 2.0, 1.0)
-
-        # Urgency
-        urgency_scores = {}
-        for urgency, keywords in self.urgency_keywords.items():
-            score = sum(1 for k in keywords if k in text)
-            if score > 0:
-                urgency_scores[urgency] = score
-
-        best_urgency = "low"
-        urgency_confidence = 0.0
-        if urgency_scores:
-            best_urgency = max(urgency_scores.items(), key=lambda x: x[1])[0]
-            urgency_confidence = min(max(urgency_scores.values()) / 2.0, 1.0)
+    def _prepare(self, content: str, filename: str, view: Optional[DocumentView]) -> Tuple[FrozenSet[str], str]:
+        """Tokens and lowercased text of content plus filename, reusing a view if given"""
+        if view is None:
+            text = (content + " " + filename).lower()
+            return frozenset(WORD_RE.findall(text)), text
+        filename_lower = filename.lower()
+        return view.tokens | frozenset(WORD_RE.findall(filename_lower)), view.lower + " " + filename_lower
+
+    def classify(self, content: str, filename: str = "", detailed: bool = False,
+                 view: Optional[DocumentView] = None) -> Dict[str, Any]:
+        """Rule-based classification
+
+        Per-label hit counts are only collected into ``keyword_scores`` when
+        ``detailed`` is set.
+        """
+        tokens, text = self._prepare(content, filename, view)
+
+        if not detailed:
+            best_doc_type, doc_confidence = _best_label(tokens, text, "document_types", "general", 3.0)
+            best_domain, domain_confidence = _best_label(tokens, text, "legal_domains", "general", 2.0)
+            best_urgency, urgency_confidence = _best_label(tokens, text, "urgency_levels", "low", 2.0)
+
+            return {
+                "document_type": best_doc_type,
+                "document_type_confidence": doc_confidence,
+                "legal_domain": best_domain,
+                "legal_domain_confidence": domain_confidence,
+                "urgency": best_urgency,
+                "urgency_confidence": urgency_confidence
+            }
+
+        scores = count_keyword_hits(text, tokens=tokens)
+
+        doc_type_scores = scores["document_types"]
+        domain_scores = scores["legal_domains"]
+        urgency_scores = scores["urgency_levels"]
+
+        best_doc_type, doc_confidence = _score(doc_type_scores, "general", 3.0)
+        best_domain, domain_confidence = _score(domain_scores, "general", 2.0)
+        best_urgency, urgency_confidence = _score(urgency_scores, "low", 2.0)
 
         return {
             "document_type": best_doc_type,
@@ -62,4 +154,66 @@ class RuleBasedClassifier:
                 "legal_domains": domain_scores,
                 "urgency_levels": urgency_scores
             }
-        }
\ No newline at end of file
+        }
+
+    def classify_domain_and_urgency(self, content: str, filename: str = "",
+                                    view: Optional[DocumentView] = None) -> Dict[str, Any]:
+        """Legal domain and urgency only - skips the document type keywords"""
+        tokens, text = self._prepare(content, filename, view)
+
+        best_domain, domain_confidence = _best_label(tokens, text, "legal_domains", "general", 2.0)
+        best_urgency, urgency_confidence = _best_label(tokens, text, "urgency_levels", "low", 2.0)
+
+        return {
+            "legal_domain": best_domain,
+            "legal_domain_confidence": domain_confidence,
+            "urgency": best_urgency,
+            "urgency_confidence": urgency_confidence
+        }
+
+    def classify_batch(self, contents: List[str], filenames: List[str]) -> List[Dict[str, Any]]:
+        """Rule-based classification of many documents in one vectorized pass
+
+        Builds a keyword x document hit matrix and reduces it to per-label
+        scores with one matrix product per category. Results match
+        ``classify`` without ``detailed``.
+        """
+        texts = [(content + " " + filename).lower() for content, filename in zip(contents, filenames)]
+        hits = np.zeros((BATCH_ROW_COUNT, len(texts)), dtype=np.int32)
+
+        for col, text in enumerate(texts):
+            tokens = frozenset(WORD_RE.findall(text))
+            for word in tokens.intersection(BATCH_WORD_ROWS):
+                hits[BATCH_WORD_ROWS[word], col] = 1
+            for phrase, row in BATCH_PHRASE_ROWS:
+                if phrase in text:
+                    hits[row, col] = 1
+
+        picks = {}
+        for category, default, denom in (
+            ("document_types", "general", 3.0),
+            ("legal_domains", "general", 2.0),
+            ("urgency_levels", "low", 2.0),
+        ):
+            labels, start, end, membership = BATCH_CATEGORIES[category]
+            scores = membership @ hits[start:end]
+            best = scores.argmax(axis=0)
+            best_scores = scores[best, np.arange(len(texts))]
+            picks[category] = [
+                (labels[idx], min(score / denom, 1.0)) if score > 0 else (default, 0.0)
+                for idx, score in zip(best.tolist(), best_scores.tolist())
+            ]
+
+        return [
+            {
+                "document_type": doc_type[0],
+                "document_type_confidence": doc_type[1],
+                "legal_domain": domain[0],
+                "legal_domain_confidence": domain[1],
+                "urgency": urgency[0],
+                "urgency_confidence": urgency[1]
+            }
+            for doc_type, domain, urgency in zip(
+                picks["document_types"], picks["legal_domains"], picks["urgency_levels"]
+            )
+        ]
\ No newline at end of file
@@ -1,124 +1,71 @@
 """Dedicated demo service that showcases AI processing without database persistence."""
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import re
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from datetime import datetime, timezone
 import os
-import glob
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from app.services.document_validator import LegalContractValidator
-from app.utils.file_utils import parse_file_content
+from app.services.document_validator import validator
+from app.utils.file_utils import extract_text_from_file
 
-validator = LegalContractValidator()
 logger = logging.getLogger("demo_service")
 
-class DemoService:
-    """Demo service that processes sample documents without database persistence."""
-    
-    def __init__(self):
-        # DocumentProcessor is static, no need to instantiate
-        self.sample_contracts_folder = os.path.join("sample_contracts")
-        self.sample_documents = {
-            "employment_contract": {
-                "base_filename": "employment_contract",
-                "title": "Employment Contract Demo Analysis",
-                "note": "Sample employment contract for demonstration"
-            },
-            "service_agreement": {
-                "base_filename": "service_agreement", 
-                "title": "Service Agreement Demo Analysis",
-                "note": "Sample service agreement for demonstration"
-            },
-            "lease_agreement": {
-                "base_filename": "lease_agreement",
-                "title": "Lease Agreement Demo Analysis", 
-                "note": "Sample lease agreement for demonstration"
-            }
-        }
-    
-    def _find_sample_file(self, base_filename: str) -> Optional[tuple[str, str]]:
-        """
-        Find a sample file with the given base filename in supported formats.
-        
-        Args:
-            base_filename: Base name of the file to search for
-            
-        Returns:
-            Tuple of (full_path, extension) if found, None otherwise
-        """
-        if not os.path.exists(self.sample_contracts_folder):
-            logger.debug(f"Sample contracts folder '{self.sample_contracts_folder}' not found")
-            return None
-        
-        # Supported file extensions in order of preference
-        supported_extensions = ['txt', 'pdf', 'docx']
-        
-        for ext in supported_extensions:
-            pattern = os.path.join(self.sample_contracts_folder, f"{base_filename}.{ext}")
-            matching_files = glob.glob(pattern)
-            
-            if matching_files:
-                file_path = matching_files[0]  # Take the first match
-                logger.info(f"Found sample file: {file_path}")
-                return file_path, ext
-        
-        # Also check for files that start with the base filename
-        for ext in supported_extensions:
-            pattern = os.path.join(self.sample_contracts_folder, f"{base_filename}*.{ext}")
-            matching_files = glob.glob(pattern)
-            
-            if matching_files:
-                file_path = matching_files[0]  # Take the first match
-                logger.info(f"Found sample file with pattern: {file_path}")
-                return file_path, ext
-        
-        logger.debug(f"No sample file found for '{base_filename}' in '{self.sample_contracts_folder}'")
-        return None
-    
-    def _load_sample_content(self, base_filename: str) -> tuple[str, str]:
-        """
-        Load sample document content from files or fallback to hardcoded content.
-        
-        Args:
-            base_filename: Base filename to search for
-            
-        Returns:
-            Tuple of (content, actual_filename)
-        """
-        file_info = self._find_sample_file(base_filename)
-        
-        if file_info:
-            file_path, ext = file_info
-            actual_filename = os.path.basename(file_path)
-            
-            try:
-                if ext == 'txt':
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    logger.info(f"Loaded text file: {actual_filename}")
-                    return content, actual_filename
-                
-                elif ext in ['pdf', 'docx']:
-                    # Use the existing file parser utility
-                    content = parse_file_content(file_path)
-                    logger.info(f"Parsed {ext.upper()} file: {actual_filename}")
-                    return content, actual_filename
-                    
-            except Exception as e:
-                logger.warning(f"Failed to load sample file '{file_path}': {str(e)}")
-                logger.info("Falling back to hardcoded content")
-        
-        # Fallback to hardcoded content
-        fallback_content = self._get_fallback_content(f"{base_filename}.txt")
-        fallback_filename = f"sample_{base_filename}.pdf"
-        logger.info(f"Using fallback content for: {fallback_filename}")
-        
-        return fallback_content, fallback_filename
-    
-    def _get_fallback_content(self, filename: str) -> str:
-        """Fallback sample content if files are missing."""
-        fallback_content = {
-            "employment_contract.txt": """
+# Which samples to parse ahead of the first request: "none", "minimal" or "full"
+DEMO_WARMUP = os.environ.get("DEMO_WARMUP", "minimal")
+
+# Distinct sample contents whose validation and analysis are kept
+PIPELINE_CACHE_SIZE = 16
+
+
+def _keyword_pattern(keywords: list) -> re.Pattern:
+    """Compile keywords into one case-insensitive substring alternation."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+
+
+# Summary key terms, checked per line in order; the first matching category wins
+SUMMARY_TERM_PATTERNS = (
+    ("compensation terms", _keyword_pattern(['compensation', 'salary', 'payment', 'rent'])),
+    ("term duration", _keyword_pattern(['term', 'duration', 'period'])),
+    ("termination clauses", _keyword_pattern(['termination', 'end', 'expire'])),
+    ("confidentiality provisions", _keyword_pattern(['confidential', 'proprietary', 'trade secret'])),
+)
+
+ELEMENT_MAPPING = {
+    "parties": ["party", "between", "client", "employee", "tenant", "landlord"],
+    "compensation": ["salary", "payment", "rent", "fee", "amount"],
+    "term": ["term", "period", "duration", "commence", "expire"],
+    "obligations": ["duties", "responsibilities", "obligations", "shall"],
+    "termination": ["terminate", "termination", "end", "cancel"]
+}
+# Kept as one pattern per element: each search stops at its element's first
+# keyword, which beats a single combined alternation here since Python's re
+# still tries every alternative per position and has to resume after each hit
+# to catch overlapping keywords
+ELEMENT_PATTERNS = tuple(
+    (element, _keyword_pattern(keywords)) for element, keywords in ELEMENT_MAPPING.items()
+)
+
+CLAUSE_KEYWORD_PATTERN = _keyword_pattern(
+    ['compensation', 'payment', 'term', 'termination', 'confidentiality',
+     'liability', 'warranty', 'intellectual property', 'rent', 'deposit']
+)
+
+# Placeholder markers plus the spelled-out phrase, which only counts as
+# placeholder text and not towards the completeness penalty
+PLACEHOLDER_PATTERN = re.compile(r'\[|xxx|tbd|(?P<phrase>to be determined)', re.IGNORECASE)
+LIABILITY_PATTERN = _keyword_pattern(['liability'])
+TERMINATION_PATTERN = _keyword_pattern(['termination'])
+
+# Sample content used when a demo file is missing, shared read-only by all instances
+FALLBACK_CONTENT: Mapping[str, str] = MappingProxyType({
+    "employment_contract.txt": """
 EMPLOYMENT AGREEMENT
 
 This Employment Agreement ("Agreement") is entered into on [DATE] between [COMPANY NAME], a corporation organized under the laws of [STATE] ("Company"), and [EMPLOYEE NAME] ("Employee").
@@ -145,7 +92,7 @@ IN WITNESS WHEREOF, the parties have executed this Agreement as of the date firs
 
 Company: _________________    Employee: _________________
             """,
-            "service_agreement.txt": """
+    "service_agreement.txt": """
 SERVICE AGREEMENT
 
 This Service Agreement ("Agreement") is made between [CLIENT NAME] ("Client") and [SERVICE PROVIDER NAME] ("Service Provider").
@@ -174,7 +121,7 @@ This agreement may be terminated by either party with [NOTICE PERIOD] written no
 Signed:
 Client: _________________    Service Provider: _________________
             """,
-            "lease_agreement.txt": """
+    "lease_agreement.txt": """
 RESIDENTIAL LEASE AGREEMENT
 
 This Lease Agreement is entered into between [LANDLORD NAME] ("Landlord") and [TENANT NAME] ("Tenant") for the property located at [PROPERTY ADDRESS].
@@ -206,29 +153,291 @@ This lease shall be governed by the laws of [STATE/JURISDICTION].
 Landlord: _________________    Tenant: _________________
 Date: _________________        Date: _________________
             """
+})
+DEFAULT_FALLBACK_CONTENT = "Sample legal document content for demonstration purposes."
+
+
+@lru_cache(maxsize=8)
+def _normalize_tag(value: str) -> str:
+    """Lowercase a contract type and join its words with underscores for use as a tag"""
+    return value.lower().replace(' ', '_')
+
+
+class DemoService:
+    """Demo service that processes sample documents without database persistence."""
+    
+    sample_documents: Mapping[str, Dict[str, str]] = MappingProxyType({
+        "employment_contract": {
+            "base_filename": "employment_contract",
+            "title": "Employment Contract Demo Analysis",
+            "note": "Sample employment contract for demonstration"
+        },
+        "service_agreement": {
+            "base_filename": "service_agreement", 
+            "title": "Service Agreement Demo Analysis",
+            "note": "Sample service agreement for demonstration"
+        },
+        "lease_agreement": {
+            "base_filename": "lease_agreement",
+            "title": "Lease Agreement Demo Analysis", 
+            "note": "Sample lease agreement for demonstration"
+        }
+    })
+    
+    def __init__(self):
+        # DocumentProcessor is static, no need to instantiate
+        self.sample_contracts_folder = os.path.join("sample_contracts")
+        # Fixed views of sample_documents used on every request and index rebuild
+        self._valid_types = frozenset(self.sample_documents)
+        self._base_filenames = tuple(doc_info["base_filename"] for doc_info in self.sample_documents.values())
+        # Sample files resolved by one folder scan, keyed by base filename and
+        # rebuilt only when the folder's mtime changes
+        self._file_index: Dict[str, tuple[str, str]] = {}
+        self._index_mtime_ns: Optional[int] = None
+        self._build_index()
+        # Parsed sample text keyed by path, stored with the (mtime_ns, size) it was read at
+        self._content_cache: Dict[str, tuple[int, int, str]] = {}
+        # Static part of each demo response, in response key order; copied and
+        # filled in per request
+        self._response_templates: Dict[str, Dict[str, Any]] = {
+            document_type: {
+                "title": info["title"],
+                "processing_success": None,
+                "note": info.get("note"),
+                "filename": None,
+                "summary": None,
+                "validation": None,
+                "classification": None,
+                "tags": None,
+                "clauses": None,
+                "rejection_reason": None,
+                "demo_metadata": {
+                    "document_type": document_type,
+                    "processed_at": None,
+                    "is_demo": True,
+                    "source": None
+                }
+            }
+            for document_type, info in self.sample_documents.items()
         }
-        return fallback_content.get(filename, "Sample legal document content for demonstration purposes.")
+        # Last assembled response per document type with the content it was
+        # built from; reused while the loader keeps returning that same content
+        self._response_cache: Dict[str, tuple[str, Dict[str, Any]]] = {}
+        # Validation and mock analysis results keyed by a digest of the content
+        self._pipeline_cache: OrderedDict[bytes, tuple] = OrderedDict()
+    
+    def _folder_mtime_ns(self) -> Optional[int]:
+        """Modification time of the sample folder, or None if it is missing."""
+        try:
+            return os.stat(self.sample_contracts_folder).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _build_index(self) -> None:
+        """Resolve every configured base filename with a single folder scan."""
+        self._index_mtime_ns = self._folder_mtime_ns()
+        self._file_index = self._scan_sample_folder(self._base_filenames)
     
-    def _generate_mock_summary(self, content: str, contract_type: str) -> str:
+    def _find_sample_file(self, base_filename: str) -> Optional[tuple[str, str]]:
+        """
+        Find a sample file with the given base filename in supported formats.
+        
+        Args:
+            base_filename: Base name of the file to search for
+            
+        Returns:
+            Tuple of (full_path, extension) if found, None otherwise
+        """
+        self._refresh_index()
+        return self._file_index.get(base_filename)
+    
+    def _refresh_index(self) -> None:
+        """Rebuild the file index if the sample folder changed since the last scan."""
+        if self._folder_mtime_ns() != self._index_mtime_ns:
+            self._build_index()
+    
+    def _scan_sample_folder(self, base_filenames: tuple) -> Dict[str, tuple[str, str]]:
+        """Scan the sample folder once and pick the best file for each base filename."""
+        # Supported file extensions in order of preference
+        supported_extensions = ['txt', 'pdf', 'docx']
+        
+        # Best (preference_rank, path, ext) per base, for exact names and for prefixed names
+        exact_matches: Dict[str, tuple] = {}
+        prefix_matches: Dict[str, tuple] = {}
+        
+        try:
+            with os.scandir(self.sample_contracts_folder) as entries:
+                for entry in entries:
+                    name = entry.name
+                    stem, dot, ext = name.rpartition('.')
+                    if not dot or ext not in supported_extensions or not entry.is_file():
+                        continue
+                    
+                    candidate = (supported_extensions.index(ext), entry.path, ext)
+                    for base_filename in base_filenames:
+                        if not name.startswith(base_filename):
+                            continue
+                        matches = exact_matches if stem == base_filename else prefix_matches
+                        current = matches.get(base_filename)
+                        if current is None or candidate[0] < current[0]:
+                            matches[base_filename] = candidate
+        except (FileNotFoundError, NotADirectoryError):
+            logger.debug(f"Sample contracts folder '{self.sample_contracts_folder}' not found")
+            return {}
+        
+        index = {}
+        for base_filename in base_filenames:
+            if base_filename in exact_matches:
+                _, file_path, ext = exact_matches[base_filename]
+                logger.info(f"Found sample file: {file_path}")
+            elif base_filename in prefix_matches:
+                # Also accept files that start with the base filename
+                _, file_path, ext = prefix_matches[base_filename]
+                logger.info(f"Found sample file with pattern: {file_path}")
+            else:
+                logger.debug(f"No sample file found for '{base_filename}' in '{self.sample_contracts_folder}'")
+                continue
+            index[base_filename] = (file_path, ext)
+        
+        return index
+    
+    def _load_sample_content(self, base_filename: str) -> tuple[str, str, str]:
+        """
+        Load sample document content from files or fallback to hardcoded content.
+        
+        Args:
+            base_filename: Base filename to search for
+            
+        Returns:
+            Tuple of (content, actual_filename, source) where source is "file" or "fallback"
+        """
+        file_info = self._find_sample_file(base_filename)
+        
+        if file_info:
+            file_path, ext = file_info
+            actual_filename = os.path.basename(file_path)
+            
+            try:
+                stat = os.stat(file_path)
+                cached = self._content_cache.get(file_path)
+                if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                    return cached[2], actual_filename, "file"
+                
+                if ext == 'txt':
+                    # One raw read sized from the stat above, decoded in a single
+                    # step rather than through the text-mode reader
+                    with open(file_path, 'rb') as f:
+                        data = f.read(stat.st_size + 1)
+                    content = data.decode('utf-8')
+                    if '\r' in content:
+                        # Same universal-newline handling as text mode
+                        content = content.replace('\r\n', '\n').replace('\r', '\n')
+                    logger.info(f"Loaded text file: {actual_filename}")
+                
+                elif ext in ['pdf', 'docx']:
+                    # Use the existing path-based file parser utility
+                    content = extract_text_from_file(file_path)
+                    logger.info(f"Parsed {ext.upper()} file: {actual_filename}")
+                
+                self._content_cache[file_path] = (stat.st_mtime_ns, stat.st_size, content)
+                return content, actual_filename, "file"
+                    
+            except Exception as e:
+                logger.warning(f"Failed to load sample file '{file_path}': {str(e)}")
+                logger.info("Falling back to hardcoded content")
+        
+        # Fallback to hardcoded content
+        fallback_content = self._get_fallback_content(f"{base_filename}.txt")
+        fallback_filename = f"sample_{base_filename}.pdf"
+        logger.info(f"Using fallback content for: {fallback_filename}")
+        
+        return fallback_content, fallback_filename, "fallback"
+    
+    def _get_fallback_content(self, filename: str) -> str:
+        """Fallback sample content if files are missing."""
+        return FALLBACK_CONTENT.get(filename, DEFAULT_FALLBACK_CONTENT)
+    
+    def warmup(self, strategy: str = DEMO_WARMUP) -> int:
+        """
+        Parse sample documents ahead of time so the first demo request hits the content cache.
+        
+        Args:
+            strategy: "none" skips warmup, "minimal" loads the employment contract,
+                "full" loads every configured sample in parallel
+            
+        Returns:
+            Number of samples loaded
+        """
+        if strategy == "none":
+            return 0
+        
+        if strategy == "full":
+            base_filenames = self._base_filenames
+        else:
+            base_filenames = [self.sample_documents["employment_contract"]["base_filename"]]
+        
+        with ThreadPoolExecutor(max_workers=len(base_filenames)) as executor:
+            results = list(executor.map(self._load_sample_content, base_filenames))
+        
+        logger.info(f"[DEMO WARMUP] Loaded {len(results)} sample(s) with strategy '{strategy}'")
+        return len(results)
+    
+    def _analyze_content(self, content: str) -> Dict[str, Any]:
+        """
+        Scan a document once and collect everything the mock generators need.
+        
+        Lines are walked a single time for summary key terms and clauses; the
+        whole-document checks use case-insensitive patterns instead of a
+        lowercased copy.
+        """
+        # Insertion-ordered set of key terms; the summary only uses the first 3
+        key_terms: Dict[str, None] = {}
+        clauses = []
+        
+        for line in content.split('\n'):
+            # Both consumers are satisfied; the rest of the document adds nothing
+            if len(key_terms) >= 3 and len(clauses) >= 5:
+                break
+            
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Look for common contract elements
+            if len(key_terms) < 3:
+                for key_term, pattern in SUMMARY_TERM_PATTERNS:
+                    if pattern.search(line):
+                        key_terms[key_term] = None
+                        break
+            
+            # Look for numbered clauses or important contract terms
+            if len(clauses) < 5 and (line[:1].isdigit() or CLAUSE_KEYWORD_PATTERN.search(line)):
+                if len(line) < 200:  # Keep clauses concise
+                    clauses.append(line)
+        
+        # One placeholder scan answers both flags; it stops at the first marker
+        has_placeholder_text = has_placeholder_marker = False
+        for match in PLACEHOLDER_PATTERN.finditer(content):
+            has_placeholder_text = True
+            if match.lastgroup != "phrase":
+                has_placeholder_marker = True
+                break
+        
+        return {
+            "length": len(content),
+            "key_terms": list(key_terms),
+            "clauses": clauses,
+            "elements": self._extract_key_elements(content),
+            "has_liability": LIABILITY_PATTERN.search(content) is not None,
+            "has_termination": TERMINATION_PATTERN.search(content) is not None,
+            "has_placeholder_text": has_placeholder_text,
+            "has_placeholder_marker": has_placeholder_marker
+        }
+    
+    def _generate_mock_summary(self, analysis: Dict[str, Any], contract_type: str) -> str:
         """Generate a mock summary for demo purposes."""
-        # Extract some basic info from content for realistic summary
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        key_terms = []
-        
-        # Look for common contract elements
-        for line in lines:
-            lower_line = line.lower()
-            if any(term in lower_line for term in ['compensation', 'salary', 'payment', 'rent']):
-                key_terms.append("compensation terms")
-            elif any(term in lower_line for term in ['term', 'duration', 'period']):
-                key_terms.append("term duration")
-            elif any(term in lower_line for term in ['termination', 'end', 'expire']):
-                key_terms.append("termination clauses")
-            elif any(term in lower_line for term in ['confidential', 'proprietary', 'trade secret']):
-                key_terms.append("confidentiality provisions")
-        
-        # Remove duplicates and limit
-        key_terms = list(set(key_terms))[:3]
+        # Already de-duplicated in document order
+        key_terms = analysis["key_terms"][:3]
         
         if key_terms:
             terms_text = ", ".join(key_terms)
@@ -238,17 +447,16 @@ Date: _________________        Date: _________________
         
         return summary
     
-    def _generate_mock_classification(self, content: str, contract_type: str, confidence: float) -> Dict[str, Any]:
+    def _generate_mock_classification(self, analysis: Dict[str, Any], contract_type: str, confidence: float) -> Dict[str, Any]:
         """Generate mock classification results for demo purposes."""
         # Mock risk assessment based on content analysis
         risk_indicators = []
-        content_lower = content.lower()
         
-        if 'liability' not in content_lower:
+        if not analysis["has_liability"]:
             risk_indicators.append("Missing liability clauses")
-        if 'termination' not in content_lower:
+        if not analysis["has_termination"]:
             risk_indicators.append("Unclear termination terms")
-        if any(term in content_lower for term in ['[', 'xxx', 'tbd', 'to be determined']):
+        if analysis["has_placeholder_text"]:
             risk_indicators.append("Contains placeholder text")
         
         risk_level = "high" if len(risk_indicators) > 2 else "medium" if risk_indicators else "low"
@@ -260,45 +468,26 @@ Date: _________________        Date: _________________
                 "level": risk_level,
                 "indicators": risk_indicators[:3]  # Limit to 3
             },
-            "key_elements": self._extract_key_elements(content),
-            "completeness_score": self._calculate_completeness_score(content)
+            "key_elements": analysis["elements"],
+            "completeness_score": self._calculate_completeness_score(analysis)
         }
         
         return classification_result
     
     def _extract_key_elements(self, content: str) -> list:
         """Extract key contractual elements from content."""
-        elements = []
-        content_lower = content.lower()
-        
-        element_mapping = {
-            "parties": ["party", "between", "client", "employee", "tenant", "landlord"],
-            "compensation": ["salary", "payment", "rent", "fee", "amount"],
-            "term": ["term", "period", "duration", "commence", "expire"],
-            "obligations": ["duties", "responsibilities", "obligations", "shall"],
-            "termination": ["terminate", "termination", "end", "cancel"]
-        }
-        
-        for element, keywords in element_mapping.items():
-            if any(keyword in content_lower for keyword in keywords):
-                elements.append(element)
-        
-        return elements
+        return [element for element, pattern in ELEMENT_PATTERNS if pattern.search(content)]
     
-    def _calculate_completeness_score(self, content: str) -> float:
+    def _calculate_completeness_score(self, analysis: Dict[str, Any]) -> float:
         """Calculate a mock completeness score based on content analysis."""
         # Simple heuristic based on content length and key elements
-        base_score = min(len(content) / 1000, 0.8)  # Length factor
+        base_score = min(analysis["length"] / 1000, 0.8)  # Length factor
         
         # Bonus for having key elements
-        key_elements = self._extract_key_elements(content)
-        element_bonus = len(key_elements) * 0.1
+        element_bonus = len(analysis["elements"]) * 0.1
         
         # Penalty for placeholders
-        content_lower = content.lower()
-        placeholder_penalty = 0
-        if any(term in content_lower for term in ['[', 'xxx', 'tbd']):
-            placeholder_penalty = 0.2
+        placeholder_penalty = 0.2 if analysis["has_placeholder_marker"] else 0
         
         score = min(base_score + element_bonus - placeholder_penalty, 1.0)
         return round(score, 2)
@@ -308,7 +497,7 @@ Date: _________________        Date: _________________
         tags = []
         
         # Add contract type tag
-        tags.append(contract_type.lower().replace(' ', '_'))
+        tags.append(_normalize_tag(contract_type))
         
         # Add risk level tag
         if 'risk_assessment' in classification_result:
@@ -343,60 +532,86 @@ Date: _________________        Date: _________________
             Dict containing all analysis results
         """
         logger.info(f"[DEMO START] Processing {document_type} demo")
+        processed_at = datetime.now(timezone.utc).isoformat()
         
         # Get sample document
-        if document_type not in self.sample_documents:
+        if document_type not in self._valid_types:
             document_type = "employment_contract"  # Default fallback
             
         sample_doc_config = self.sample_documents[document_type]
         base_filename = sample_doc_config["base_filename"]
-        
-        # Load content and get actual filename
-        content, actual_filename = self._load_sample_content(base_filename)
+        title = sample_doc_config["title"]
+        
+        # Load content and get actual filename; file reads and PDF/DOCX parsing block
+        content, actual_filename, source = await asyncio.to_thread(self._load_sample_content, base_filename)
+        
+        # Samples are static, so only the timestamp differs between requests. The
+        # content cache hands back a new string whenever the file's mtime changes.
+        cached = self._response_cache.get(document_type)
+        if cached and cached[0] is content and cached[1]["filename"] == actual_filename:
+            logger.info(f"[DEMO CACHE] Reusing {actual_filename} demo result")
+            demo_response = cached[1].copy()
+            demo_response["demo_metadata"] = {**demo_response["demo_metadata"], "processed_at": processed_at}
+            return demo_response
         
         try:
-            # Step 1: Contract Validation (same as production)
-            logger.info(f"[DEMO VALIDATION] Validating {actual_filename}")
-            validation_result = validator.validate(content)
-            
-            # Step 2: AI Processing (simplified for demo)
-            if validation_result.is_valid:
-                logger.info(f"[DEMO PROCESSING] Running AI analysis on {actual_filename}")
+            # Validation and mock generation depend only on the text, so identical
+            # content (e.g. a sample re-saved unchanged) skips straight to the response
+            content_key = hashlib.blake2b(content.encode('utf-8', errors='ignore'), digest_size=16).digest()
+            pipeline = self._pipeline_cache.get(content_key)
+            if pipeline is None:
+                # Step 1: Contract Validation (same as production)
+                logger.info(f"[DEMO VALIDATION] Validating {actual_filename}")
+                validation_result = await asyncio.to_thread(validator.validate, content)
+                contract_type = validation_result.contract_type.value
                 
-                # Get contract type as string
-                contract_type = validation_result.contract_type.value if hasattr(validation_result.contract_type, 'value') else str(validation_result.contract_type)
+                # Step 2: AI Processing (simplified for demo)
+                if validation_result.is_valid:
+                    logger.info(f"[DEMO PROCESSING] Running AI analysis on {actual_filename}")
                 
-                # Generate mock AI analysis results
-                summary = self._generate_mock_summary(content, contract_type)
-                classification_result = self._generate_mock_classification(content, contract_type, validation_result.confidence)
+                    # Generate mock AI analysis results from a single content scan
+                    analysis = self._analyze_content(content)
+                    summary = self._generate_mock_summary(analysis, contract_type)
+                    classification_result = self._generate_mock_classification(analysis, contract_type, validation_result.confidence)
                 
-                # Generate tags
-                tags = self._generate_tags(classification_result, contract_type)
+                    # Generate tags
+                    tags = self._generate_tags(classification_result, contract_type)
                 
-                # Extract key clauses for demo
-                clauses = self._extract_demo_clauses(content, classification_result)
+                    # Extract key clauses for demo
+                    clauses = self._extract_demo_clauses(analysis)
                 
-                processing_success = True
-                rejection_reason = None
+                    processing_success = True
+                    rejection_reason = None
                 
+                else:
+                    # Handle invalid contract demo
+                    summary = "This document did not pass our AI validation checks."
+                    classification_result = {}
+                    tags = ["validation_failed"]
+                    clauses = []
+                    processing_success = False
+                    rejection_reason = validation_result.message
+                
+                pipeline = (validation_result, contract_type, summary, classification_result,
+                            tags, clauses, processing_success, rejection_reason)
+                self._pipeline_cache[content_key] = pipeline
+                if len(self._pipeline_cache) > PIPELINE_CACHE_SIZE:
+                    self._pipeline_cache.popitem(last=False)
             else:
-                # Handle invalid contract demo
-                summary = "This document did not pass our AI validation checks."
-                classification_result = {}
-                tags = ["validation_failed"]
-                clauses = []
-                processing_success = False
-                rejection_reason = validation_result.message
+                self._pipeline_cache.move_to_end(content_key)
+                logger.info(f"[DEMO CACHE] Reusing analysis for identical content of {actual_filename}")
+            
+            (validation_result, contract_type, summary, classification_result,
+             tags, clauses, processing_success, rejection_reason) = pipeline
             
-            # Step 3: Build comprehensive response
-            demo_response = {
-                "title": sample_doc_config["title"],
+            # Step 3: Build comprehensive response from the per-type template
+            demo_response = self._response_templates[document_type].copy()
+            demo_response.update({
                 "processing_success": processing_success,
-                "note": sample_doc_config.get("note"),
                 "filename": actual_filename,
                 "summary": summary,
                 "validation": {
-                    "contract_type": validation_result.contract_type.value if hasattr(validation_result.contract_type, 'value') else str(validation_result.contract_type),
+                    "contract_type": contract_type,
                     "confidence": float(validation_result.confidence),
                     "is_valid": validation_result.is_valid
                 },
@@ -405,25 +620,25 @@ Date: _________________        Date: _________________
                 "clauses": clauses,
                 "rejection_reason": rejection_reason,
                 "demo_metadata": {
-                    "document_type": document_type,
-                    "processed_at": datetime.now(timezone.utc).isoformat(),
-                    "is_demo": True,
-                    "source": "file" if self._find_sample_file(base_filename) else "fallback"
+                    **demo_response["demo_metadata"],
+                    "processed_at": processed_at,
+                    "source": source
                 }
-            }
+            })
             
             logger.info(f"[DEMO SUCCESS] {actual_filename} demo completed")
             logger.info(f"  - Validation: {'PASSED' if processing_success else 'FAILED'}")
-            logger.info(f"  - Contract Type: {validation_result.contract_type.value if hasattr(validation_result.contract_type, 'value') else validation_result.contract_type}")
+            logger.info(f"  - Contract Type: {contract_type}")
             logger.info(f"  - Confidence: {validation_result.confidence:.2%}")
-            logger.info(f"  - Source: {'File' if self._find_sample_file(base_filename) else 'Fallback'}")
+            logger.info(f"  - Source: {source.capitalize()}")
             
+            self._response_cache[document_type] = (content, demo_response)
             return demo_response
             
         except Exception as e:
             logger.error(f"[DEMO ERROR] Failed to process {actual_filename}: {str(e)}")
             return {
-                "title": f"Demo Error - {sample_doc_config['title']}",
+                "title": f"Demo Error - {title}",
                 "processing_success": False,
                 "rejection_reason": f"Demo processing failed: {str(e)}",
                 "note": "Demo encountered an error",
@@ -434,41 +649,27 @@ Date: _________________        Date: _________________
                 "clauses": [],
                 "demo_metadata": {
                     "document_type": document_type,
-                    "processed_at": datetime.now(timezone.utc).isoformat(),
+                    "processed_at": processed_at,
                     "is_demo": True,
                     "error": str(e),
                     "source": "error"
                 }
             }
     
-    def _extract_demo_clauses(self, content: str, classification_result: Dict) -> list:
-        """Extract key clauses for demo display."""
-        # Simple clause extraction based on common contract patterns
-        clauses = []
-        lines = content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            # Look for numbered clauses or important contract terms
-            if (line and 
-                (line[0].isdigit() or 
-                 any(keyword in line.lower() for keyword in 
-                     ['compensation', 'payment', 'term', 'termination', 'confidentiality', 
-                      'liability', 'warranty', 'intellectual property', 'rent', 'deposit']))):
-                if len(line) < 200:  # Keep clauses concise
-                    clauses.append(line)
-                if len(clauses) >= 5:  # Limit to 5 key clauses
-                    break
-        
+    def _extract_demo_clauses(self, analysis: Dict[str, Any]) -> list:
+        """Key clauses for demo display, taken from the content analysis."""
+        clauses = analysis["clauses"]
         return clauses[:5] if clauses else ["Key contractual terms and obligations identified"]
     
     def get_available_demos(self) -> Dict[str, Dict[str, str]]:
         """Get list of available demo document types with file status."""
+        # One folder stat, then pure index lookups
+        self._refresh_index()
         available_demos = {}
         
         for doc_type, doc_info in self.sample_documents.items():
             base_filename = doc_info["base_filename"]
-            file_info = self._find_sample_file(base_filename)
+            file_info = self._file_index.get(base_filename)
             
             available_demos[doc_type] = {
                 "title": doc_info["title"],
@@ -1,6 +1,12 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+import asyncio
+import copy
+import hashlib
 import re
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from app.services.embedding import generate_embedding
 from app.models.document import AcceptedDocument
 from app.services.summarization_service import summarize_text
@@ -8,6 +14,85 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Extraction patterns, compiled once at import. The clause patterns run against
+# the lowercased content; the party and date patterns carry IGNORECASE instead.
+# Where only the first hit is used they are applied with search(), which stops
+# there instead of collecting every match in the document.
+LEASE_TERM_PATTERNS = [re.compile(pattern) for pattern in (
+    r'lease.*?term.*?(\d+)\s*(year|month|day)s?',
+    r'term.*?of.*?(\d+)\s*(year|month|day)s?',
+    r'(\d+)\s*(year|month|day)\s*lease',
+    r'tenancy.*?(\d+)\s*(year|month|day)s?'
+)]
+# Rent and deposit patterns capture the reported amount as group 1: the first
+# dollar amount of what the match covers. The lookahead in the last rent pattern
+# keeps the 'payment' requirement while still capturing the earliest amount.
+RENT_PATTERNS = [re.compile(pattern) for pattern in (
+    r'(\$[\d,]+(?:\.\d{2})?)\s*(?:per\s*month|monthly|/month)',
+    r'rent.*?(\$[\d,]+(?:\.\d{2})?)',
+    r'monthly(?=.*?payment.*?\$[\d,]+).*?(\$[\d,]+(?:\.\d{2})?)'
+)]
+DEPOSIT_PATTERNS = [re.compile(pattern) for pattern in (
+    r'(?:security\s*deposit|deposit).*?(\$[\d,]+(?:\.\d{2})?)',
+    r'(\$[\d,]+(?:\.\d{2})?)\s*(?:security\s*deposit|deposit)'
+)]
+NOTICE_PATTERN = re.compile(r'(\d+)\s*(?:day|week|month)s?\s*(?:notice|notification)')
+AMOUNT_PATTERN = re.compile(r'\$[\d,]+(?:\.\d{2})?')
+# (pattern, role) pairs; lessor/lessee are reported as Landlord/Tenant
+PARTY_PATTERNS = [
+    (re.compile(r'Landlord[:\s]+([A-Za-z\s]+)', re.IGNORECASE), 'Landlord'),
+    (re.compile(r'Tenant[:\s]+([A-Za-z\s]+)', re.IGNORECASE), 'Tenant'),
+    (re.compile(r'Lessor[:\s]+([A-Za-z\s]+)', re.IGNORECASE), 'Landlord'),
+    (re.compile(r'Lessee[:\s]+([A-Za-z\s]+)', re.IGNORECASE), 'Tenant')
+]
+DATE_PATTERN = re.compile(
+    r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b',
+    re.IGNORECASE
+)
+TERM_LENGTH_PATTERN = re.compile(r'(\d+)\s*(year|month|day)s?', re.IGNORECASE)
+
+# Extractor output keyed by a digest of the document content, most recent last
+ANALYSIS_CACHE_SIZE = 128
+_analysis_cache: OrderedDict[bytes, Tuple] = OrderedDict()
+
+
+def _content_key(content: str) -> bytes:
+    """Digest of the document text used as the analysis cache key"""
+    return hashlib.blake2b(content.encode('utf-8', errors='ignore'), digest_size=16).digest()
+
+
+def _analysis_cache_get(key: bytes) -> Optional[Tuple]:
+    """Return a copy of cached extractor output so callers can't mutate the cache"""
+    cached = _analysis_cache.get(key)
+    if cached is None:
+        return None
+    _analysis_cache.move_to_end(key)
+    return copy.deepcopy(cached)
+
+
+def _analysis_cache_put(key: bytes, extracted: Tuple) -> None:
+    """Store extractor output, evicting the least recently used entry past the limit"""
+    _analysis_cache[key] = copy.deepcopy(extracted)
+    if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=1024)
+def _format_upload_date(upload_date: datetime) -> str:
+    """Upload dates never change once stored, so each is formatted only once"""
+    return upload_date.strftime('%Y-%m-%d %H:%M:%S')
+
+
+# Status saves still in flight; the event loop only keeps weak references to tasks
+_pending_saves = set()
+
+
+def _log_save_result(task: asyncio.Task) -> None:
+    """Drop a finished save task and log it if the write failed"""
+    _pending_saves.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Failed to save analysis status: {task.exception()}")
+
 class DocumentAnalysisService:
     """
     Service to extract legal document insights for the frontend interface
@@ -23,6 +108,12 @@ class DocumentAnalysisService:
             'utilities': ['utilities', 'electric', 'gas', 'water', 'internet', 'cable', 'heating'],
             'pets': ['pet', 'pets', 'animal', 'dog', 'cat']
         }
+        # (lowercased keyword, display term) for every keyword, in category order
+        self._key_term_table = [
+            (keyword.lower(), keyword.title())
+            for keywords in self.legal_keywords.values()
+            for keyword in keywords
+        ]
 
     async def analyze_document(self, document_id: str) -> Dict[str, Any]:
         doc = await AcceptedDocument.get(document_id)
@@ -32,6 +123,8 @@ class DocumentAnalysisService:
         content = doc.content
         if not content:
             raise ValueError("Document has no content")
+        # Shared by every helper below instead of each lowercasing the document again
+        content_lower = content.lower()
 
         try:
             if hasattr(doc, 'analysis_results') and doc.analysis_results:
@@ -57,7 +150,7 @@ class DocumentAnalysisService:
                         dates_from_existing = []
                     
                     # Use existing dates if available, otherwise use what's directly stored
-                    final_dates = existing_dates if existing_dates else dates_from_existing
+                    final_dates = existing_dates or dates_from_existing
                     
                     # Return existing results with proper formatting and safe fallbacks
                     return {
@@ -67,21 +160,33 @@ class DocumentAnalysisService:
                         },
                         'clause_overview': existing_results['clause_overview'],
                         'summary': existing_results.get('summary', {'text': doc.summary or "Summary not available"}),
-                        'financial_summary': existing_financial if existing_financial else self._extract_financial_info(content),
-                        'term_information': existing_term_info if existing_term_info else self._extract_term_information(content),
-                        'parties_involved': existing_parties if existing_parties else self._extract_parties(content),
+                        'financial_summary': existing_financial or self._extract_financial_info(content),
+                        'term_information': existing_term_info or self._extract_term_information(content, content_lower),
+                        'parties_involved': existing_parties or self._extract_parties(content),
                         'important_dates': final_dates,
-                        'key_terms': existing_key_terms if existing_key_terms else self._extract_key_terms(content)
+                        'key_terms': existing_key_terms or self._extract_key_terms(content_lower)
                     }
             
             # Extract data (fallback if no existing results)
             logger.info(f"Extracting clauses for document {document_id}, content length: {len(content)}")
-            clauses = self._extract_clauses(content)
+            # Extraction depends only on the text, so repeat views of unchanged content reuse it
+            cache_key = _content_key(content)
+            extracted = _analysis_cache_get(cache_key)
+            if extracted is None:
+                # The extractors are independent and CPU-bound; run them off the event loop together
+                extracted = await asyncio.gather(
+                    asyncio.to_thread(self._extract_clauses, content, content_lower),
+                    asyncio.to_thread(self._extract_financial_info, content),
+                    asyncio.to_thread(self._extract_dates_and_terms, content),
+                    asyncio.to_thread(self._extract_parties, content),
+                    asyncio.to_thread(self._extract_key_terms, content_lower)
+                )
+                _analysis_cache_put(cache_key, tuple(extracted))
+            else:
+                logger.info(f"Reusing cached extraction for document {document_id}")
+            clauses, financial_info, dates_terms, parties, key_terms = extracted
             logger.info(f"Extracted {len(clauses)} clauses for document {document_id}")
             
-            financial_info = self._extract_financial_info(content)
-            dates_terms = self._extract_dates_and_terms(content)
-            
             # Safe access to dates and term lengths
             important_dates = dates_terms.get('dates', []) if isinstance(dates_terms, dict) else []
             term_lengths = dates_terms.get('term_lengths', []) if isinstance(dates_terms, dict) else []
@@ -105,19 +210,22 @@ class DocumentAnalysisService:
                 'term_information': {  # Add missing term_information with safe access
                     'lease_duration': primary_term,
                     'primary_term': primary_term,
-                    'renewal_option': "Available" if "renew" in content.lower() else "Not specified",
-                    'renewal_term': "Standard" if "renew" in content.lower() else "Not specified"
+                    'renewal_option': "Available" if "renew" in content_lower else "Not specified",
+                    'renewal_term': "Standard" if "renew" in content_lower else "Not specified"
                 },
-                'parties_involved': self._extract_parties(content),
+                'parties_involved': parties,
                 'important_dates': important_dates,
-                'key_terms': self._extract_key_terms(content)
+                'key_terms': key_terms
             }
 
             # Update document status
             doc.analysis_status = "completed"
             doc.contract_analyzed = True
             doc.analysis_completed_at = datetime.utcnow()
-            await doc.save()
+            # The response does not depend on the write, so let it overlap with serialization
+            save_task = asyncio.create_task(doc.save())
+            _pending_saves.add(save_task)
+            save_task.add_done_callback(_log_save_result)
 
             return analysis
             
@@ -131,32 +239,24 @@ class DocumentAnalysisService:
         return {
             'filename': doc.filename,
             'file_type': doc.file_type,
-            'upload_date': doc.upload_date.strftime('%Y-%m-%d %H:%M:%S'),
+            'upload_date': _format_upload_date(doc.upload_date),
             'processed': str(doc.processed)
         }
 
-    def _extract_clauses(self, content: str) -> List[Dict[str, str]]:
+    def _extract_clauses(self, content: str, content_lower: str) -> List[Dict[str, str]]:
         """
         Simplified and more reliable clause extraction with better structure matching frontend expectations
         """
         clauses = []
-        content_lower = content.lower()
         
         logger.info(f"Starting clause extraction, content length: {len(content)}")
         
         # 1. Lease Term Detection
-        lease_patterns = [
-            r'lease.*?term.*?(\d+)\s*(year|month|day)s?',
-            r'term.*?of.*?(\d+)\s*(year|month|day)s?',
-            r'(\d+)\s*(year|month|day)\s*lease',
-            r'tenancy.*?(\d+)\s*(year|month|day)s?'
-        ]
-        
         lease_term_found = False
-        for pattern in lease_patterns:
-            matches = re.findall(pattern, content_lower)
-            if matches:
-                num, period = matches[0]
+        for pattern in LEASE_TERM_PATTERNS:
+            match = pattern.search(content_lower)
+            if match:
+                num, period = match.groups()
                 term_text = f"{num} {period}{'s' if int(num) > 1 else ''}"
                 clauses.append({
                     'type': term_text,
@@ -177,27 +277,20 @@ class DocumentAnalysisService:
             })
 
         # 2. Rent Amount Detection
-        rent_patterns = [
-            r'\$[\d,]+(?:\.\d{2})?\s*(?:per\s*month|monthly|/month)',
-            r'rent.*?\$[\d,]+(?:\.\d{2})?',
-            r'monthly.*?payment.*?\$[\d,]+(?:\.\d{2})?'
-        ]
-        
         rent_found = False
-        for pattern in rent_patterns:
-            matches = re.findall(pattern, content_lower)
-            if matches:
-                amount = re.search(r'\$[\d,]+(?:\.\d{2})?', matches[0])
-                if amount:
-                    clauses.append({
-                        'type': f"{amount.group()}/month",
-                        'category': 'Rent Amount',
-                        'icon': 'dollar-sign',
-                        'content': f"Monthly rent: {amount.group()}"
-                    })
-                    rent_found = True
-                    logger.info(f"Found rent amount: {amount.group()}")
-                    break
+        for pattern in RENT_PATTERNS:
+            match = pattern.search(content_lower)
+            if match:
+                amount = match.group(1)
+                clauses.append({
+                    'type': f"{amount}/month",
+                    'category': 'Rent Amount',
+                    'icon': 'dollar-sign',
+                    'content': f"Monthly rent: {amount}"
+                })
+                rent_found = True
+                logger.info(f"Found rent amount: {amount}")
+                break
         
         if not rent_found:
             # Fallback: look for any dollar amount
@@ -230,8 +323,8 @@ class DocumentAnalysisService:
             })
 
         # 4. Security Deposit
-        if any(keyword in content_lower for keyword in ['deposit', 'security deposit']):
-            deposit_amount = self._extract_deposit_amount(content)
+        if 'deposit' in content_lower:
+            deposit_amount = self._extract_deposit_amount(content_lower)
             clauses.append({
                 'type': deposit_amount or 'Security Deposit Required',
                 'category': 'Security Deposit',
@@ -241,9 +334,10 @@ class DocumentAnalysisService:
 
         # 5. Maintenance Responsibilities
         if any(keyword in content_lower for keyword in ['maintenance', 'repair', 'upkeep']):
-            if 'tenant' in content_lower and any(word in content_lower for word in ['responsible', 'maintain']):
+            duty_stated = 'responsible' in content_lower or 'maintain' in content_lower
+            if duty_stated and 'tenant' in content_lower:
                 responsibility = 'Tenant Responsible'
-            elif 'landlord' in content_lower and any(word in content_lower for word in ['responsible', 'maintain']):
+            elif duty_stated and 'landlord' in content_lower:
                 responsibility = 'Landlord Responsible'
             else:
                 responsibility = 'Shared Responsibility'
@@ -257,10 +351,9 @@ class DocumentAnalysisService:
 
         # 6. Termination/Notice
         if any(keyword in content_lower for keyword in ['terminate', 'notice', 'cancel', 'end']):
-            notice_pattern = r'(\d+)\s*(?:day|week|month)s?\s*(?:notice|notification)'
-            notice_matches = re.findall(notice_pattern, content_lower)
+            notice_match = NOTICE_PATTERN.search(content_lower)
             
-            notice_text = f"{notice_matches[0]} days notice" if notice_matches else "Notice Required"
+            notice_text = f"{notice_match.group(1)} days notice" if notice_match else "Notice Required"
             clauses.append({
                 'type': notice_text,
                 'category': 'Termination Rights',
@@ -278,7 +371,7 @@ class DocumentAnalysisService:
             })
 
         # 8. Pet Policy
-        if any(keyword in content_lower for keyword in ['pet', 'pets', 'animal']):
+        if any(keyword in content_lower for keyword in ['pet', 'animal']):
             if 'no pets' in content_lower:
                 pet_policy = 'No Pets Allowed'
             elif 'pets allowed' in content_lower:
@@ -316,28 +409,23 @@ class DocumentAnalysisService:
         
         return clauses
 
-    def _extract_deposit_amount(self, content: str) -> str:
-        """Extract security deposit amount"""
-        deposit_patterns = [
-            r'(?:security\s*deposit|deposit).*?\$[\d,]+(?:\.\d{2})?',
-            r'\$[\d,]+(?:\.\d{2})?\s*(?:security\s*deposit|deposit)'
-        ]
-        
-        for pattern in deposit_patterns:
-            matches = re.findall(pattern, content.lower())
-            if matches:
-                amount = re.search(r'\$[\d,]+(?:\.\d{2})?', matches[0])
-                if amount:
-                    return amount.group()
+    def _extract_deposit_amount(self, content_lower: str) -> str:
+        """Extract security deposit amount from already lowercased content"""
+        for pattern in DEPOSIT_PATTERNS:
+            match = pattern.search(content_lower)
+            if match:
+                return match.group(1)
         return None
 
-    def _extract_key_terms(self, content: str) -> List[str]:
-        terms = []
-        for keywords in self.legal_keywords.values():
-            for keyword in keywords:
-                if keyword.lower() in content.lower():
-                    terms.append(keyword.title())
-        return list(set(terms))[:10]
+    def _extract_key_terms(self, content_lower: str) -> List[str]:
+        # Insertion-ordered set: deduplicates while keeping keyword order, stops at 10
+        terms: Dict[str, None] = {}
+        for keyword, term in self._key_term_table:
+            if keyword in content_lower:
+                terms[term] = None
+                if len(terms) >= 10:
+                    break
+        return list(terms)
 
     def _extract_financial_info(self, content: str) -> Dict[str, Any]:
         """Extract financial information with proper error handling"""
@@ -350,17 +438,9 @@ class DocumentAnalysisService:
 
     def _extract_parties(self, content: str) -> List[Dict[str, str]]:
         parties = []
-        name_patterns = [
-            r'Landlord[:\s]+([A-Za-z\s]+)',
-            r'Tenant[:\s]+([A-Za-z\s]+)',
-            r'Lessor[:\s]+([A-Za-z\s]+)',
-            r'Lessee[:\s]+([A-Za-z\s]+)'
-        ]
-
-        for pattern in name_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
+        for pattern, role in PARTY_PATTERNS:
+            matches = pattern.findall(content)
             for match in matches:
-                role = 'Landlord' if 'landlord' in pattern.lower() or 'lessor' in pattern.lower() else 'Tenant'
                 parties.append({
                     'name': match.strip(),
                     'role': role
@@ -369,18 +449,23 @@ class DocumentAnalysisService:
         return parties
 
     def _extract_dates_and_terms(self, content: str) -> Dict[str, Any]:
-        """Extract dates and terms with proper error handling"""
+        """Extract dates and terms with proper error handling
+
+        Only the first term length is ever used (as the primary term), so the
+        term scan stops at the first match and ``term_lengths`` holds at most one entry.
+        """
         try:
-            date_pattern = r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'
-            dates = list(re.finditer(date_pattern, content, re.IGNORECASE))
-            formatted_dates = [match.group() for match in dates[:5]]
+            formatted_dates = [match.group() for match in islice(DATE_PATTERN.finditer(content), 5)]
 
-            term_pattern = r'(\d+)\s*(year|month|day)s?'
-            terms = re.findall(term_pattern, content, re.IGNORECASE)
+            term = TERM_LENGTH_PATTERN.search(content)
+            term_lengths = []
+            if term:
+                num, period = term.groups()
+                term_lengths.append(f"{num} {period}{'s' if int(num) > 1 else ''}")
 
             return {
                 'dates': formatted_dates,
-                'term_lengths': [f"{num} {period}{'s' if int(num) > 1 else ''}" for num, period in terms]
+                'term_lengths': term_lengths
             }
         except Exception as e:
             logger.error(f"Error extracting dates and terms: {str(e)}")
@@ -394,26 +479,27 @@ class DocumentAnalysisService:
         return any(keyword.lower() in content_lower for keyword in keywords)
 
     def _extract_amount(self, content: str) -> str:
-        amount_pattern = r'\$[\d,]+(?:\.\d{2})?'
-        matches = re.findall(amount_pattern, content)
-        return matches[0] if matches else None
+        match = AMOUNT_PATTERN.search(content)
+        return match.group() if match else None
 
     def _extract_all_amounts(self, content: str) -> List[str]:
-        amount_pattern = r'\$[\d,]+(?:\.\d{2})?'
-        return re.findall(amount_pattern, content)
+        return AMOUNT_PATTERN.findall(content)
 
-    def _extract_term_information(self, content: str) -> Dict[str, Any]:
+    def _extract_term_information(self, content: str, content_lower: str) -> Dict[str, Any]:
         """Extract term information with proper error handling"""
         try:
-            dates_terms = self._extract_dates_and_terms(content)
+            # Reuse the date/term scan from a cached full extraction of this text if there is one;
+            # it is only read here, so the entry need not be copied
+            cached = _analysis_cache.get(_content_key(content))
+            dates_terms = cached[2] if cached is not None else self._extract_dates_and_terms(content)
             term_lengths = dates_terms.get('term_lengths', []) if isinstance(dates_terms, dict) else []
             primary_term = term_lengths[0] if term_lengths and len(term_lengths) > 0 else None
             
             return {
                 'lease_duration': primary_term,
                 'primary_term': primary_term,
-                'renewal_option': "Available" if "renew" in content.lower() else "Not specified",
-                'renewal_term': "Standard" if "renew" in content.lower() else "Not specified"
+                'renewal_option': "Available" if "renew" in content_lower else "Not specified",
+                'renewal_term': "Standard" if "renew" in content_lower else "Not specified"
             }
         except Exception as e:
             logger.error(f"Error extracting term information: {str(e)}")
@@ -434,11 +520,8 @@ async def get_document_analysis(document_id: str):
         logger.info(f"Analysis completed for {document_id}, clause_overview length: {len(analysis.get('clause_overview', []))}")
         return analysis
     except Exception as e:
-        logger.error(f"Analysis failed for {document_id}: {str(e)}")
-        logger.error(f"Exception type: {type(e).__name__}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        
+        # The handler formats the traceback only if the record is actually emitted
+        logger.exception("Analysis failed for %s", document_id)
 
         return {
             'error': str(e),
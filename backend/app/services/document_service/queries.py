@@ -3,7 +3,7 @@ from app.models.document import AcceptedDocument
 from app.models.rejected_document import RejectedDocument
 from app.schemas.document import AcceptedDocumentRead, RejectedDocumentRead
 from bson import ObjectId
-from app.services.document_service.serialization import convert_objectid_to_str, serialize_document
+from app.services.document_service.serialization import serialize_document
 from beanie import PydanticObjectId
 import logging
 
@@ -11,17 +11,19 @@ import logging
 logger = logging.getLogger(__name__)
 
 async def get_user_documents(user_id: str):
+    # Project to the read schema so embeddings, chunks and stored analysis stay in Mongo
     documents = await AcceptedDocument.find(
         AcceptedDocument.user_id == user_id
-    ).sort(-AcceptedDocument.upload_date).to_list()
-    return [AcceptedDocumentRead.model_validate(convert_objectid_to_str(doc)) for doc in documents]
+    ).sort(-AcceptedDocument.upload_date).project(AcceptedDocumentRead).to_list()
+    # The projection already yields AcceptedDocumentRead models
+    return documents
 
 
 async def get_user_rejected_documents(user_id: str):
     rejected_documents = await RejectedDocument.find(
         RejectedDocument.user_id == user_id
-    ).sort(-RejectedDocument.upload_date).to_list()
-    return [RejectedDocumentRead.model_validate(convert_objectid_to_str(doc)) for doc in rejected_documents]
+    ).sort(-RejectedDocument.upload_date).project(RejectedDocumentRead).to_list()
+    return rejected_documents
 
 
 async def get_document_by_id(user_id: str, document_id: str):
@@ -48,8 +50,8 @@ async def get_documents_by_type(user_id: str, document_type: str = None, urgency
             del query["tags"]
         else:
             query["tags"] = {"$in": [f"urgency_{urgency}"]}
-    documents = await AcceptedDocument.find(query).sort(-AcceptedDocument.upload_date).to_list()
-    return [AcceptedDocumentRead.model_validate(convert_objectid_to_str(doc)) for doc in documents]
+    documents = await AcceptedDocument.find(query).sort(-AcceptedDocument.upload_date).project(AcceptedDocumentRead).to_list()
+    return documents
 
 
 async def delete_document_by_id(user_id: PydanticObjectId, document_id: PydanticObjectId) -> bool:
@@ -7,24 +7,16 @@ logger = logging.getLogger("document_serialization")
 def convert_objectid_to_str(document) -> dict:
     """Convert MongoDB document with ObjectId to dict with string id"""
     if hasattr(document, 'model_dump'):
-        doc_dict = document.model_dump(by_alias=True)
-    else:
-        doc_dict = dict(document)
-
-    if '_id' in doc_dict and isinstance(doc_dict['_id'], ObjectId):
-        doc_dict['_id'] = str(doc_dict['_id'])
+        # JSON mode converts ObjectId and datetime values (nested ones included)
+        # inside pydantic-core, so no Python-level walk is needed
+        return document.model_dump(by_alias=True, mode="json")
 
+    doc_dict = dict(document)
     for key, value in doc_dict.items():
         if isinstance(value, ObjectId):
             doc_dict[key] = str(value)
         elif isinstance(value, datetime):
             doc_dict[key] = value.isoformat()
-        elif isinstance(value, dict):
-            for nested_key, nested_value in value.items():
-                if isinstance(nested_value, datetime):
-                    value[nested_key] = nested_value.isoformat()
-                elif isinstance(nested_value, ObjectId):
-                    value[nested_key] = str(nested_value)
     return doc_dict
 
 
@@ -34,7 +26,7 @@ def serialize_validation_result(validation_result: dict) -> dict:
         return {}
     return {
         "is_valid": validation_result.is_valid,
-        "contract_type": validation_result.contract_type.value if hasattr(validation_result.contract_type, 'value') else str(validation_result.contract_type),
+        "contract_type": validation_result.contract_type.value,
         "confidence": float(validation_result.confidence),
         "message": str(validation_result.message),
         "found_elements": list(validation_result.found_elements) if validation_result.found_elements else [],
@@ -1,21 +1,35 @@
+import asyncio
 import logging
 from app.models.document import AcceptedDocument
 from app.models.rejected_document import RejectedDocument
 
 logger = logging.getLogger("document_stats")
 
+def _validation_rejections_query(user_id: str) -> dict:
+    """Rejections flagged by the contract validator
+
+    Documents stored before is_validation_rejection existed don't carry the
+    flag, so they still fall back to matching the reason text.
+    """
+    return {
+        "user_id": user_id,
+        "$or": [
+            {"is_validation_rejection": True},
+            {
+                "is_validation_rejection": {"$exists": False},
+                "reason": {"$regex": "Invalid legal contract", "$options": "i"}
+            }
+        ]
+    }
+
 async def get_user_validation_stats(user_id: str) -> dict:
     try:
-        accepted_docs = await AcceptedDocument.find(
-            AcceptedDocument.user_id == user_id
-        ).count()
-        rejected_docs = await RejectedDocument.find(
-            RejectedDocument.user_id == user_id
-        ).count()
-        validation_rejections = await RejectedDocument.find({
-            "user_id": user_id,
-            "reason": {"$regex": "Invalid legal contract", "$options": "i"}
-        }).count()
+        # Independent index-backed counts, issued concurrently
+        accepted_docs, rejected_docs, validation_rejections = await asyncio.gather(
+            AcceptedDocument.find(AcceptedDocument.user_id == user_id).count(),
+            RejectedDocument.find(RejectedDocument.user_id == user_id).count(),
+            RejectedDocument.find(_validation_rejections_query(user_id)).count()
+        )
         return {
             "total_uploads": accepted_docs + rejected_docs,
             "valid_contracts": accepted_docs,
@@ -1,100 +1,113 @@
-from app.services.document_service.serialization import convert_objectid_to_str, serialize_validation_result
+from app.services.document_service.serialization import serialize_validation_result
 from app.services.document_service.exceptions import ContractValidationError
 
+import asyncio
+import hashlib
 import logging
 import time
 from datetime import datetime, timezone
 from bson import ObjectId
 import numpy as np
 
-from app.services.document_validator import LegalContractValidator
+from app.services.document_validator import validator
 from app.models.document import AcceptedDocument
 from app.models.rejected_document import RejectedDocument
-from app.utils.file_utils import parse_file_content
+from app.utils.file_utils import extract_text_from_bytes
 from app.schemas.document import AcceptedDocumentRead, RejectedDocumentRead
 
 logger = logging.getLogger("document_upload")
 
-validator = LegalContractValidator()
+# Rejection records still being written; the event loop only keeps weak references to tasks
+_pending_inserts = set()
+
+
+def _log_insert_result(task: asyncio.Task) -> None:
+    """Drop a finished insert task and log it if the write failed"""
+    _pending_inserts.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Failed to record rejected upload: {task.exception()}")
 
 
 async def handle_document_upload(user_id: str, file):
     logger.info(f"[UPLOAD START] User={user_id}, File={file.filename}, Type={file.content_type}")
+    # One timestamp for the whole upload, so all records it creates agree
+    now = datetime.now(timezone.utc)
 
-    # Step 1: Check for empty files 
-    content_bytes = await file.read()
-    if not content_bytes:
-        reason = "Empty file uploaded"
-        rejected = await RejectedDocument(
+    def _reject(reason: str, **extra) -> RejectedDocument:
+        """Record the upload as rejected for the given reason"""
+        rejected = RejectedDocument(
             filename=file.filename,
             file_type=file.content_type,
             reason=reason,
             user_id=user_id,
-            upload_date=datetime.now(timezone.utc)
-        ).insert()
-        return RejectedDocumentRead.model_validate(convert_objectid_to_str(rejected))
-
-    await file.seek(0)
+            upload_date=now,
+            **extra
+        )
+        # The id is assigned client-side and the response is built from this
+        # instance, so the client does not wait on the write
+        insert_task = asyncio.create_task(rejected.insert())
+        _pending_inserts.add(insert_task)
+        insert_task.add_done_callback(_log_insert_result)
+        return rejected
 
-    # Step 2: Extract text 
+    # Step 1: Check for empty files 
+    content_bytes = await file.read()
+    if not content_bytes:
+        reason = "Empty file uploaded"
+        rejected = _reject(reason)
+        return RejectedDocumentRead.model_validate(rejected, from_attributes=True)
+
+    # Same file already accepted for this user: return that document instead of
+    # repeating extraction, validation and background processing. A copy whose
+    # processing failed does not count, so re-uploading retries it.
+    content_hash = hashlib.blake2b(content_bytes, digest_size=16).hexdigest()
+    existing = await AcceptedDocument.find_one(
+        AcceptedDocument.user_id == str(user_id),
+        AcceptedDocument.content_hash == content_hash,
+        AcceptedDocument.processing_status != "failed"
+    )
+    if existing:
+        logger.info(f"[UPLOAD DUPLICATE] Document {existing.id} already holds this file")
+        result = AcceptedDocumentRead.model_validate(existing, from_attributes=True).model_dump()
+        result['document_id'] = str(existing.id)
+        result['contract_validation'] = existing.contract_validation or {}
+        result['duplicate'] = True
+        result['status'] = existing.processing_status
+        return result
+
+    # Step 2: Extract text from the bytes already read, off the event loop
     try:
-        content = await parse_file_content(file)
+        content = await asyncio.to_thread(extract_text_from_bytes, file.filename, content_bytes)
     except Exception as e:
         reason = f"Text extraction failed: {str(e)}"
-        rejected = await RejectedDocument(
-            filename=file.filename,
-            file_type=file.content_type,
-            reason=reason,
-            user_id=user_id,
-            upload_date=datetime.now(timezone.utc)
-        ).insert()
-        return RejectedDocumentRead.model_validate(convert_objectid_to_str(rejected))
+        rejected = _reject(reason)
+        return RejectedDocumentRead.model_validate(rejected, from_attributes=True)
 
     if not content or len(content.strip()) < 50:
         reason = f"Document content insufficient (only {len(content.strip())} characters, minimum 50 required)"
-        rejected = await RejectedDocument(
-            filename=file.filename,
-            file_type=file.content_type,
-            reason=reason,
-            user_id=user_id,
-            upload_date=datetime.now(timezone.utc)
-        ).insert()
-        return RejectedDocumentRead.model_validate(convert_objectid_to_str(rejected))
+        rejected = _reject(reason)
+        return RejectedDocumentRead.model_validate(rejected, from_attributes=True)
 
     # Step 3: Contract validation (ONLY validation, no AI processing)
     try:
-        validation_result = validator.validate(content)
+        # Validation may run (and on first use load) Legal-BERT; keep it off the event loop
+        validation_result = await asyncio.to_thread(validator.validate, content)
         if not validation_result.is_valid:
             reason = f"Contract validation failed: {validation_result.message}"
-            rejected = await RejectedDocument(
-                filename=file.filename,
-                file_type=file.content_type,
-                reason=reason,
-                user_id=user_id,
-                upload_date=datetime.now(timezone.utc),
-                validation_details=serialize_validation_result(validation_result)
-            ).insert()
-            rejection_response = RejectedDocumentRead.model_validate(convert_objectid_to_str(rejected))
+            validation_details = serialize_validation_result(validation_result)
+            rejected = _reject(reason, validation_details=validation_details)
+            rejection_response = RejectedDocumentRead.model_validate(rejected, from_attributes=True)
             rejection_dict = rejection_response.model_dump()
             rejection_dict["validation_error"] = True
-            rejection_dict["validation_details"] = serialize_validation_result(validation_result)
+            rejection_dict["validation_details"] = validation_details
             return rejection_dict
     except Exception as e:
         reason = f"Contract validation system error: {str(e)}"
-        rejected = await RejectedDocument(
-            filename=file.filename,
-            file_type=file.content_type,
-            reason=reason,
-            user_id=user_id,
-            upload_date=datetime.now(timezone.utc),
-            validation_details={"error": str(e)}
-        ).insert()
-        return RejectedDocumentRead.model_validate(convert_objectid_to_str(rejected))
+        rejected = _reject(reason, validation_details={"error": str(e)})
+        return RejectedDocumentRead.model_validate(rejected, from_attributes=True)
 
     # Step 4: Basic contract type tag (from validation only)
-    contract_type = validation_result.contract_type.value \
-        if hasattr(validation_result.contract_type, 'value') \
-        else str(validation_result.contract_type)
+    contract_type = validation_result.contract_type.value
     
     basic_tags = [f"contract_{contract_type}", "validated_contract"]
 
@@ -108,29 +121,41 @@ async def handle_document_upload(user_id: str, file):
         embedding=[],  # Empty initially
         tags=basic_tags,  # Only basic tags from validation
         user_id=user_id,
-        upload_date=datetime.now(timezone.utc),
+        upload_date=now,
         processing_status="pending",  # PENDING - background task will complete
         processed=False,  # Not fully processed yet
         analysis_status="pending",  # AI analysis pending
         classification_result={},  # Empty initially
+        content_hash=content_hash,
         contract_validation={
             "is_valid": validation_result.is_valid,
             "contract_type": contract_type,
             "confidence": float(validation_result.confidence),
-            "validated_at": datetime.now(timezone.utc)
+            "validated_at": now
         }
     )
     saved_doc = await document.insert()
 
     logger.info(f"[UPLOAD COMPLETE] Document {saved_doc.id} saved with pending status")
 
-    # Step 6: Return minimal response data for immediate use
-    saved_doc_dict = convert_objectid_to_str(saved_doc)
-    response_data = AcceptedDocumentRead.model_validate(saved_doc_dict, from_attributes=True)
-
-    result = response_data.model_dump()
+    # Step 6: Return minimal response data for immediate use. Every field was set
+    # above, so the AcceptedDocumentRead shape is built directly rather than
+    # re-validating the document just inserted
+    result = {
+        "filename": saved_doc.filename,
+        "file_type": saved_doc.file_type,
+        "content": saved_doc.content,
+        "summary": saved_doc.summary,
+        "tags": saved_doc.tags,
+        "processed": saved_doc.processed,
+        "confidence_score": saved_doc.confidence_score,
+        "classification_result": saved_doc.classification_result,
+        "contract_validation": serialize_validation_result(validation_result),
+        "id": str(saved_doc.id),
+        "user_id": saved_doc.user_id,
+        "upload_date": saved_doc.upload_date
+    }
     result['document_id'] = str(saved_doc.id)
-    result['contract_validation'] = serialize_validation_result(validation_result)
     
     # Indicate that background processing is needed
     result['needs_background_processing'] = True
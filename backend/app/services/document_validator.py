@@ -1,6 +1,11 @@
 # contract_validator.py
+import copy
+import hashlib
+import logging
 import re
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 from enum import Enum
 from dataclasses import dataclass
 import dateparser 
@@ -9,7 +14,49 @@ from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 LEGAL_PATH = settings.AI_MODELS.LEGAL_NAME_MODEL
+VALIDATION_CACHE_SIZE = 256
+# Longer documents are validated on their head and tail only
+VALIDATION_PROBE_CHARS = 20000
+
+# Patterns compiled once at import. Each element group is a single alternation:
+# only whether any member matches is used, so one scan answers the whole group.
+ELEMENT_PATTERNS = [(element, re.compile("|".join(patterns), re.IGNORECASE)) for element, patterns in (
+    ("contract_formation", (
+        r"\bthis agreement\b", r"\bthis contract\b", r"\bagreement is made\b",
+        r"\bcontract is entered\b", r"\bhereby agree\b"
+    )),
+    ("party_identification", (
+        r"\bbetween .+ and .+\b", r"\blandlord\b", r"\btenant\b",
+        r"\bemployer\b", r"\bemployee\b", r"\bbuyer\b", r"\bseller\b"
+    )),
+    ("legal_obligations", (
+        r"\bshall pay\b", r"\bmust provide\b", r"\bis required to\b",
+        r"\bobliged to\b", r"\bresponsible for\b"
+    )),
+    ("substantive_terms", (
+        r"\bterms\b", r"\bconditions\b", r"\bpayment\b", r"\bdeposit\b",
+        r"\bduration\b", r"\btermination\b"
+    ))
+)]
+# Date-like spans (numeric, ISO and written-month forms); only these reach dateparser
+MONTH_NAME = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+DATE_CANDIDATE_PATTERN = re.compile(
+    r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}"
+    r"|\d{4}-\d{1,2}-\d{1,2}"
+    rf"|{MONTH_NAME}\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{MONTH_NAME},?\s+\d{{4}})\b",
+    re.IGNORECASE
+)
+DATE_PARSER_SETTINGS = {"PARSERS": ["absolute-time"]}
+MONEY_PATTERN = re.compile(r"\$\d+(?:,\d{3})*(?:\.\d+)?")
+COMPANY_PATTERN = re.compile(r"\b[A-Z][A-Za-z0-9&,. ]+(?:Inc|LLC|Corp|Ltd)\b")
+# (keyword, pattern) pairs; the matching keywords themselves are reported
+CONSTRAINT_PATTERNS = [(kw, re.compile(rf"\b{kw}\b", re.IGNORECASE)) for kw in (
+    "shall", "must", "required", "prohibited", "not allowed"
+)]
 
 class ContractType(Enum):
     """Enumeration of contract types"""
@@ -21,6 +68,17 @@ class ContractType(Enum):
     GENERAL = "general"
     UNKNOWN = "unknown"
 
+# (type, keywords) in priority order: lease, employment, service, sales, NDA.
+# Keywords are plain substrings of the lowercased text, so one that contains
+# another listed keyword (e.g. "services") would never change the outcome.
+CONTRACT_TYPE_KEYWORDS = [
+    (ContractType.LEASE, ("lease", "rent", "tenant", "landlord", "property", "premises")),
+    (ContractType.EMPLOYMENT, ("employee", "employer", "employment", "job", "salary", "wages")),
+    (ContractType.SERVICE, ("service", "contractor", "client", "work performed")),
+    (ContractType.SALES, ("purchase", "sale", "buyer", "seller", "goods", "merchandise")),
+    (ContractType.NDA, ("confidential", "non-disclosure", "proprietary", "trade secret"))
+]
+
 @dataclass
 class ValidationResult:
     """Result object for contract validation"""
@@ -33,76 +91,101 @@ class ValidationResult:
 
 class LegalContractValidator:
     def __init__(self, model_path: Path = LEGAL_PATH):
-        # --- Rule-based legal keywords ---
-        self.key_patterns = [
+        # --- Rule-based legal keywords (each counts once, so they stay separate) ---
+        self.key_patterns = [re.compile(p, re.IGNORECASE) for p in (
             r"\bparty\b", r"\bagreement\b", r"\bhereinafter\b",
             r"\bshall\b", r"\bwhereas\b", r"\bliability\b",
             r"\bgoverning law\b", r"\bjurisdiction\b"
-        ]
+        )]
 
-        try:
-            # Load HuggingFace Legal-BERT Classifier from local path
-            self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
-        except Exception as e:
-            print(f"Warning: Could not load ML model from {model_path}: {e}")
-            self.tokenizer = None
-            self.model = None
+        # Legal-BERT is loaded on first use rather than here, so importing the
+        # module (and starting a worker) does not wait on the model
+        self.model_path = model_path
+        self.tokenizer = None
+        self.model = None
+        self._model_loaded = False
+        self._load_lock = threading.Lock()
+        # How often the heuristics settled a document without Legal-BERT
+        self._ml_runs = 0
+        self._ml_skips = 0
+        self._stats_lock = threading.Lock()
+
+        # Validation results keyed by a content digest, most recent last; the shared
+        # validator runs in worker threads, so access goes through the lock
+        self._cache: "OrderedDict[bytes, ValidationResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _ensure_model_loaded(self) -> None:
+        """Load the classifier once; concurrent first callers wait for the same load"""
+        if self._model_loaded:
+            return
+        with self._load_lock:
+            if self._model_loaded:
+                return
+            try:
+                # Load HuggingFace Legal-BERT Classifier from local path
+                tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+                model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
+                model.eval()
+                # INT8 dynamic quantization of the Linear layers: the encoder matmuls dominate
+                # CPU inference, and weights shrink ~4x with negligible accuracy loss
+                self.model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                self.tokenizer = tokenizer
+            except Exception as e:
+                logger.warning("Could not load ML model from %s: %s", self.model_path, e)
+                self.tokenizer = None
+                self.model = None
+            self._model_loaded = True
+
+    def _cache_get(self, key: bytes) -> Optional[ValidationResult]:
+        """Return a copy of a cached result, refreshing its LRU position"""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+        return copy.deepcopy(cached)
+
+    def _cache_put(self, key: bytes, result: ValidationResult) -> None:
+        """Store a result, evicting the least recently used entry when full"""
+        stored = copy.deepcopy(result)
+        with self._cache_lock:
+            self._cache[key] = stored
+            self._cache.move_to_end(key)
+            while len(self._cache) > VALIDATION_CACHE_SIZE:
+                self._cache.popitem(last=False)
 
     def _detect_contract_type(self, text: str) -> ContractType:
         """Detect the type of contract based on keywords"""
         text_lower = text.lower()
         
-        # Lease/Rental patterns
-        lease_keywords = ["lease", "rent", "tenant", "landlord", "property", "premises"]
-        if any(keyword in text_lower for keyword in lease_keywords):
-            return ContractType.LEASE
-            
-        # Employment patterns
-        employment_keywords = ["employee", "employer", "employment", "job", "salary", "wages"]
-        if any(keyword in text_lower for keyword in employment_keywords):
-            return ContractType.EMPLOYMENT
-            
-        # Service patterns
-        service_keywords = ["service", "services", "contractor", "client", "work performed"]
-        if any(keyword in text_lower for keyword in service_keywords):
-            return ContractType.SERVICE
-            
-        # Sales patterns
-        sales_keywords = ["purchase", "sale", "buyer", "seller", "goods", "merchandise"]
-        if any(keyword in text_lower for keyword in sales_keywords):
-            return ContractType.SALES
-            
-        # NDA patterns
-        nda_keywords = ["confidential", "non-disclosure", "proprietary", "trade secret"]
-        if any(keyword in text_lower for keyword in nda_keywords):
-            return ContractType.NDA
+        # First type (in priority order) with any keyword present wins
+        for contract_type, keywords in CONTRACT_TYPE_KEYWORDS:
+            if any(keyword in text_lower for keyword in keywords):
+                return contract_type
             
         return ContractType.GENERAL
 
     def _rule_based_signals(self, text: str) -> Dict[str, Any]:
-        keyword_hits = sum(bool(re.search(p, text, re.IGNORECASE)) for p in self.key_patterns)
+        keyword_hits = sum(bool(p.search(text)) for p in self.key_patterns)
         return {"keyword_hits": keyword_hits}
 
     def _modern_signals(self, text: str) -> Dict[str, Any]:
-        # Date extraction using dateparser
-        words = text.split()
+        # Date extraction using dateparser, only on spans that look like dates
         dates = []
-        for i in range(len(words)):
-            phrase = " ".join(words[i:i+5])  # Check phrases of up to 5 words
-            dt = dateparser.parse(phrase)
+        for match in DATE_CANDIDATE_PATTERN.finditer(text):
+            dt = dateparser.parse(match.group(0), settings=DATE_PARSER_SETTINGS)
             if dt:
                 dates.append(str(dt.date()))
 
         # --- Money extraction using regex ---
-        money_terms = re.findall(r"\$\d+(?:,\d{3})*(?:\.\d+)?", text)
+        money_terms = MONEY_PATTERN.findall(text)
 
         # --- Company detection (simple heuristic) ---
-        companies = re.findall(r"\b[A-Z][A-Za-z0-9&,. ]+(?:Inc|LLC|Corp|Ltd)\b", text)
+        companies = COMPANY_PATTERN.findall(text)
 
         # --- Constraint detection (keywords) ---
-        constraint_keywords = ["shall", "must", "required", "prohibited", "not allowed"]
-        constraints = [kw for kw in constraint_keywords if re.search(rf"\b{kw}\b", text, re.IGNORECASE)]
+        constraints = [kw for kw, pattern in CONSTRAINT_PATTERNS if pattern.search(text)]
 
         return {
             "dates": dates,
@@ -113,18 +196,19 @@ class LegalContractValidator:
 
     def _ml_classification(self, text: str) -> float:
         """Return probability that the text is legal using Legal-BERT"""
+        self._ensure_model_loaded()
         if not self.tokenizer or not self.model:
             # Fallback to simple heuristic if ML model not available
             return 0.5
             
         try:
             inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = self.model(**inputs)
                 probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
             return float(probs[0][1])  # Assuming index 1 = "legal"
         except Exception as e:
-            print(f"Warning: ML classification failed: {e}")
+            logger.warning("ML classification failed: %s", e)
             return 0.5
 
     def _check_contract_elements(self, text: str) -> tuple[List[str], List[str]]:
@@ -132,45 +216,12 @@ class LegalContractValidator:
         found_elements = []
         missing_elements = []
         
-        # Check for contract formation language
-        formation_patterns = [
-            r"\bthis agreement\b", r"\bthis contract\b", r"\bagreement is made\b",
-            r"\bcontract is entered\b", r"\bhereby agree\b"
-        ]
-        if any(re.search(pattern, text, re.IGNORECASE) for pattern in formation_patterns):
-            found_elements.append("contract_formation")
-        else:
-            missing_elements.append("contract_formation")
-            
-        # Check for party identification
-        party_patterns = [
-            r"\bbetween .+ and .+\b", r"\blandlord\b", r"\btenant\b", 
-            r"\bemployer\b", r"\bemployee\b", r"\bbuyer\b", r"\bseller\b"
-        ]
-        if any(re.search(pattern, text, re.IGNORECASE) for pattern in party_patterns):
-            found_elements.append("party_identification")
-        else:
-            missing_elements.append("party_identification")
-            
-        # Check for legal obligations
-        obligation_patterns = [
-            r"\bshall pay\b", r"\bmust provide\b", r"\bis required to\b",
-            r"\bobliged to\b", r"\bresponsible for\b"
-        ]
-        if any(re.search(pattern, text, re.IGNORECASE) for pattern in obligation_patterns):
-            found_elements.append("legal_obligations")
-        else:
-            missing_elements.append("legal_obligations")
-            
-        # Check for terms and conditions
-        terms_patterns = [
-            r"\bterms\b", r"\bconditions\b", r"\bpayment\b", r"\bdeposit\b",
-            r"\bduration\b", r"\btermination\b"
-        ]
-        if any(re.search(pattern, text, re.IGNORECASE) for pattern in terms_patterns):
-            found_elements.append("substantive_terms")
-        else:
-            missing_elements.append("substantive_terms")
+        # Formation language, party identification, legal obligations, substantive terms
+        for element, pattern in ELEMENT_PATTERNS:
+            if pattern.search(text):
+                found_elements.append(element)
+            else:
+                missing_elements.append(element)
             
         return found_elements, missing_elements
 
@@ -178,22 +229,34 @@ class LegalContractValidator:
         """
         Validate if text is a legal contract and return ValidationResult object
         """
+        # Every step is a pure function of the text, so re-uploads skip the model entirely
+        cache_key = hashlib.blake2b(text.encode("utf-8", "replace"), digest_size=16).digest()
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Formation language and party clauses sit at the start and end of a contract,
+        # and Legal-BERT truncates to 512 tokens anyway, so the heuristics scan a
+        # bounded probe instead of the whole of a long document
+        if len(text) <= VALIDATION_PROBE_CHARS:
+            probe = text
+        else:
+            half = VALIDATION_PROBE_CHARS // 2
+            probe = text[:half] + "\n" + text[-half:]
+
         # --- Step 1: Rule-based signals ---
-        rule_signals = self._rule_based_signals(text)
+        rule_signals = self._rule_based_signals(probe)
         
         # --- Step 2: Modern extraction ---
-        modern_signals = self._modern_signals(text)
+        modern_signals = self._modern_signals(probe)
         
-        # --- Step 3: ML Classification ---
-        ml_confidence = self._ml_classification(text)
+        # --- Step 3: Check contract elements ---
+        found_elements, missing_elements = self._check_contract_elements(probe)
         
-        # --- Step 4: Check contract elements ---
-        found_elements, missing_elements = self._check_contract_elements(text)
+        # --- Step 4: Detect contract type ---
+        contract_type = self._detect_contract_type(probe)
         
-        # --- Step 5: Detect contract type ---
-        contract_type = self._detect_contract_type(text)
-        
-        # --- Step 6: Calculate confidence ---
+        # --- Step 5: Calculate heuristic confidence ---
         heuristic_score = rule_signals["keyword_hits"]
         if modern_signals["dates"]: heuristic_score += 1
         if modern_signals["money_terms"]: heuristic_score += 1
@@ -205,6 +268,25 @@ class LegalContractValidator:
 
         heuristic_conf = min(1.0, heuristic_score / 10)  # Adjusted denominator
 
+        # --- Step 6: ML Classification, unless the heuristics already decide ---
+        # Clear-cut contracts (every element, near-full score) and text with no legal
+        # signal at all skip the Legal-BERT forward pass, the expensive step
+        ml_skipped = True
+        if heuristic_conf >= 0.9 and not missing_elements:
+            ml_confidence = 1.0
+        elif heuristic_conf == 0 and not found_elements:
+            ml_confidence = 0.0
+        else:
+            ml_confidence = self._ml_classification(probe)
+            ml_skipped = False
+        with self._stats_lock:
+            if ml_skipped:
+                self._ml_skips += 1
+            else:
+                self._ml_runs += 1
+            ml_skips, ml_total = self._ml_skips, self._ml_skips + self._ml_runs
+        logger.debug("Legal-BERT skipped for %d of %d validations", ml_skips, ml_total)
+
         # Weighted combo: 40% heuristics + 60% ML
         final_conf = (0.4 * heuristic_conf) + (0.6 * ml_confidence)
         
@@ -218,11 +300,17 @@ class LegalContractValidator:
         else:
             message = f"Invalid legal contract: confidence too low ({final_conf:.1%}). Missing: {', '.join(missing_elements[:3])}"
         
-        return ValidationResult(
+        result = ValidationResult(
             is_valid=is_valid,
             contract_type=contract_type,
             confidence=round(final_conf, 3),
             message=message,
             found_elements=found_elements,
             missing_elements=missing_elements
-        )
\ No newline at end of file
+        )
+        self._cache_put(cache_key, result)
+        return result
+
+
+# Shared instance, so the model and result cache exist once per process
+validator = LegalContractValidator()
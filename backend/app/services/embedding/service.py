@@ -1,8 +1,9 @@
+import hashlib
 import logging
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import torch
 from transformers import AutoTokenizer, AutoModel
 from app.models.document import AcceptedDocument
@@ -11,6 +12,7 @@ from .utils import chunk_text, validate_embedding
 from app.core.config import settings
 
 EXPECTED_EMBEDDING_DIM = 768
+FALLBACK_EMBEDDING_SCALE = 0.1
 logger = logging.getLogger(__name__)
 
 class LocalEmbeddingService:
@@ -18,7 +20,7 @@ class LocalEmbeddingService:
         self.model_path = settings.AI_MODELS.EMBEDDING_MODEL
         self.expected_dim = EXPECTED_EMBEDDING_DIM
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.fallback_embedding = np.zeros(self.expected_dim).tolist()
+        self.fallback_embedding = np.zeros(self.expected_dim, dtype=np.float32)
         
         # Model components
 
@@ -36,10 +38,10 @@ class LocalEmbeddingService:
                 self.model_path,
                 local_files_only=True
             )
-            self.model = AutoModel.from_pretrained(
+            self.model = self._prepare_model(AutoModel.from_pretrained(
                 self.model_path,
                 local_files_only=True
-            ).to(self.device)
+            ))
 
             logger.info("✅ Local embedding service initialized")
 
@@ -50,7 +52,7 @@ class LocalEmbeddingService:
     def generate(self, text: str):
         """Generate embeddings for a given text."""
         if not text.strip():
-            return self.fallback_embedding
+            return self.fallback_embedding.tolist()
 
         if self.tokenizer is None or self.model is None:
             raise
@@ -63,7 +65,7 @@ class LocalEmbeddingService:
                 return_tensors="pt"
             ).to(self.device)
 
-            with torch.no_grad():
+            with torch.inference_mode():
                 model_output = self.model(**encoded_input)
 
             embeddings = model_output.last_hidden_state.mean(dim=1).cpu().numpy().tolist()[0]
@@ -71,13 +73,13 @@ class LocalEmbeddingService:
             # Ensure correct dimension
             if len(embeddings) != self.expected_dim:
                 logger.warning(f"Embedding dimension mismatch: got {len(embeddings)}, expected {self.expected_dim}")
-                return self.fallback_embedding
+                return self.fallback_embedding.tolist()
 
             return embeddings
 
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
-            return self.fallback_embedding
+            return self.fallback_embedding.tolist()
 
     def _load_local_model(self):
         """Load the local embedding model - no online fallbacks."""
@@ -89,25 +91,35 @@ class LocalEmbeddingService:
                 str(self.model_path),
                 local_files_only=True
             )
-            self.model = AutoModel.from_pretrained(
+            self.model = self._prepare_model(AutoModel.from_pretrained(
                 str(self.model_path),
                 local_files_only=True
-            )
-            
-            self.model.to(self.device)
-            self.model.eval()
+            ))
             logger.info(f"✅ Local embedding model loaded successfully on {self.device}")
             
         except Exception as e:
             logger.error(f"❌ Failed to load local model: {e}")
             raise EmbeddingError(f"Local model loading failed: {str(e)}")
 
+    def _prepare_model(self, model):
+        """Put the encoder in inference mode on the target device: INT8 on CPU, FP16 on tensor-core GPUs."""
+        model.to(self.device)
+        model.eval()
+        if self.device == "cpu":
+            # Dynamic quantization of the Linear layers; the encoder matmuls dominate CPU time
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif torch.cuda.get_device_capability()[0] >= 7:
+            # Volta and newer run half precision on tensor cores. The pooling multiplies
+            # by a float32 mask, so embeddings still come out in float32.
+            model = model.half()
+        return model
+
     def _mean_pooling(self, model_output, attention_mask):
         token_embeddings = model_output[0]
         input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
         return torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(input_mask_expanded.sum(1), min=1e-9)
 
-    def _generate_local_embedding(self, text: str) -> List[float]:
+    def _generate_local_embedding(self, text: str) -> np.ndarray:
         if not self.model or not self.tokenizer:
             raise EmbeddingError("Local model not properly initialized")
         try:
@@ -116,11 +128,11 @@ class LocalEmbeddingService:
                 raise EmbeddingError("Empty text after cleaning")
             encoded_input = self.tokenizer(cleaned_text, padding=True, truncation=True, max_length=512, return_tensors='pt')
             encoded_input = {k: v.to(self.device) for k, v in encoded_input.items()}
-            with torch.no_grad():
+            with torch.inference_mode():
                 model_output = self.model(**encoded_input)
             sentence_embedding = self._mean_pooling(model_output, encoded_input['attention_mask'])
             sentence_embedding = torch.nn.functional.normalize(sentence_embedding, p=2, dim=1)
-            embedding = sentence_embedding.cpu().numpy()[0].tolist()
+            embedding = sentence_embedding[0].cpu().numpy()
             if not validate_embedding(embedding, self.expected_dim):
                 raise EmbeddingError("Invalid embedding generated")
             return embedding
@@ -128,53 +140,80 @@ class LocalEmbeddingService:
             logger.error(f"Error generating local embedding: {e}")
             raise EmbeddingError(f"Failed to generate embedding: {str(e)}")
 
-    def _get_fallback_embedding(self, text: str) -> List[float]:
-        import hashlib
-        hash_obj = hashlib.md5(text.encode())
-        hash_int = int(hash_obj.hexdigest(), 16)
-        np.random.seed(hash_int % (2**32))
-        embedding = np.random.normal(0, 0.1, self.expected_dim)
-        return embedding.tolist()
+    def _generate_local_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed several texts with one padded forward pass.
+
+        Returns one embedding per text, or None where the text was empty or the result invalid.
+        """
+        if not self.model or not self.tokenizer:
+            raise EmbeddingError("Local model not properly initialized")
+        cleaned_texts = [text.strip() for text in texts]
+        present = [i for i, text in enumerate(cleaned_texts) if text]
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        if not present:
+            return embeddings
+        encoded_input = self.tokenizer([cleaned_texts[i] for i in present], padding=True, truncation=True, max_length=512, return_tensors='pt')
+        encoded_input = {k: v.to(self.device) for k, v in encoded_input.items()}
+        with torch.inference_mode():
+            model_output = self.model(**encoded_input)
+        # Mean pooling is masked, so padding does not leak into the shorter texts
+        sentence_embeddings = self._mean_pooling(model_output, encoded_input['attention_mask'])
+        sentence_embeddings = torch.nn.functional.normalize(sentence_embeddings, p=2, dim=1)
+        for i, embedding in zip(present, sentence_embeddings.cpu().numpy().tolist()):
+            if validate_embedding(embedding, self.expected_dim):
+                embeddings[i] = embedding
+        return embeddings
+
+    def _get_fallback_embedding(self, text: str) -> np.ndarray:
+        """Deterministic stand-in vector derived from the text.
+
+        Uses a private generator rather than reseeding the global numpy state,
+        which concurrent requests would otherwise race on.
+        """
+        seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+        rng = np.random.default_rng(seed)
+        return (rng.standard_normal(self.expected_dim) * FALLBACK_EMBEDDING_SCALE).astype(np.float32)
 
     async def generate_embedding(self, text: str) -> np.ndarray:
         """Generate embedding using local model only."""
         if not text or len(text.strip()) == 0:
-            return np.array(self.fallback_embedding)
+            return self.fallback_embedding.copy()
         
         try:
             if not self.model or not self.tokenizer:
                 raise EmbeddingError("Local model not properly initialized. Call initialize() first.")
             
-            embedding_list = self._generate_local_embedding(text)
-
-            return np.array(embedding_list)
+            return self._generate_local_embedding(text)
 
         except EmbeddingError as e:
             logger.error(f"Embedding generation failed: {e}")
-            fallback = self._get_fallback_embedding(text)
-            return np.array(fallback)
+            return self._get_fallback_embedding(text)
         except Exception as e:
             logger.error(f"Unexpected error in embedding generation: {e}")
-            return np.array(self.fallback_embedding)  
+            return self.fallback_embedding.copy()
 
     async def generate_embedding_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts using local model only."""
         if not texts:
             return []
         
-        embeddings = []
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
         batch_size = 8
+        # Batch texts of similar length together so little of each forward pass is padding
+        order = sorted(range(len(texts)), key=lambda idx: len(texts[idx]))
         
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
+        for i in range(0, len(order), batch_size):
+            batch_indices = order[i:i + batch_size]
+            batch_texts = [texts[idx] for idx in batch_indices]
+            
+            try:
+                batch_embeddings = self._generate_local_embeddings(batch_texts)
+            except Exception as e:
+                logger.warning(f"Failed to generate embeddings for a batch of {len(batch_texts)} texts: {e}")
+                batch_embeddings = [None] * len(batch_texts)
             
-            for text in batch_texts:
-                try:
-                    embedding = self._generate_local_embedding(text)
-                    embeddings.append(embedding)
-                except Exception as e:
-                    logger.warning(f"Failed to generate embedding for text {i}: {e}")
-                    embeddings.append(self._get_fallback_embedding(text))
+            for idx, text, embedding in zip(batch_indices, batch_texts, batch_embeddings):
+                embeddings[idx] = embedding if embedding is not None else self._get_fallback_embedding(text).tolist()
 
         return embeddings
 
@@ -1,5 +1,9 @@
 import re
-from typing import List
+from typing import List, Sequence, Union
+
+import numpy as np
+
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+')
 
 def chunk_text(text: str, max_tokens: int = 400) -> List[str]:
     """
@@ -9,27 +13,32 @@ def chunk_text(text: str, max_tokens: int = 400) -> List[str]:
         return []
     
     text = text.strip()
-    sentences = re.split(r'(?<=[.!?])\s+', text.replace('\n', ' '))
+    sentences = SENTENCE_BOUNDARY_PATTERN.split(text.replace('\n', ' '))
     chunks = []
-    current_chunk = ""
+    # Sentences of the chunk being built and its length once joined with spaces;
+    # tracking the length avoids re-building the growing chunk string per sentence
+    current_sentences = []
+    current_length = 0
     
     for sentence in sentences:
         sentence = sentence.strip()
         if not sentence:
             continue
         
-        potential_chunk = current_chunk + " " + sentence if current_chunk else sentence
-        estimated_tokens = len(potential_chunk) // 4
+        potential_length = current_length + 1 + len(sentence) if current_sentences else len(sentence)
+        estimated_tokens = potential_length // 4
         
         if estimated_tokens < max_tokens:
-            current_chunk = potential_chunk
+            current_sentences.append(sentence)
+            current_length = potential_length
         else:
-            if current_chunk.strip():
-                chunks.append(current_chunk.strip())
-            current_chunk = sentence
+            if current_sentences:
+                chunks.append(" ".join(current_sentences))
+            current_sentences = [sentence]
+            current_length = len(sentence)
     
-    if current_chunk.strip():
-        chunks.append(current_chunk.strip())
+    if current_sentences:
+        chunks.append(" ".join(current_sentences))
     
     if not chunks and text:
         words = text.split()
@@ -44,11 +53,7 @@ def chunk_text(text: str, max_tokens: int = 400) -> List[str]:
     return chunks
 
 
-def validate_embedding(embedding: List[float], expected_dim: int) -> bool:
-    if not embedding:
-        return False
-    if len(embedding) != expected_dim:
-        return False
-    if all(x == 0 for x in embedding):
-        return False
-    return True
+def validate_embedding(embedding: Union[np.ndarray, Sequence[float]], expected_dim: int) -> bool:
+    """A usable embedding is a 1-D vector of the expected size that is not all zeros."""
+    arr = np.asarray(embedding)
+    return arr.shape == (expected_dim,) and bool(np.any(arr))
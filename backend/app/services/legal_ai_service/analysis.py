@@ -1,22 +1,28 @@
-import json
+import asyncio
+import io
 import re
 import logging
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Optional
+
+import httpx
+import orjson
+
+from .utils import normalize_prompt_text
 
 logger = logging.getLogger(__name__)
 
+# Seconds between status checks of a submitted batch
+BATCH_POLL_INTERVAL = 30
 
-class AnalysisMixin:
-    def analyze_contract_type(self, content: str) -> Dict[str, Any]:
-        if not self.openai_client:
-            return self._fallback_contract_analysis(content)
-        
-        truncated_content = content[:self.max_context_length] if len(content) > self.max_context_length else content
-        
-        prompt = f"""You are an expert legal document analyzer. Analyze this document and provide detailed analysis.
+# Fixed prompt text around the document, built once at import rather than per call
+ANALYZER_SYSTEM_PROMPT = "You are an expert legal document analyzer with 20+ years of contract law experience. Provide detailed, professional analysis in valid JSON format only."
+ENFORCEABILITY_SYSTEM_PROMPT = "You are a contract law expert. Analyze enforceability thoroughly and provide valid JSON only."
+CONTRACT_TYPE_PROMPT_PREFIX = """You are an expert legal document analyzer. Analyze this document and provide detailed analysis.
 
 Document content:
-{truncated_content}
+"""
+CONTRACT_TYPE_PROMPT_SUFFIX = """
 
 Provide analysis in JSON format with these fields:
 1. "document_type": Primary document type (e.g., "Professional Services Agreement", "Commercial Lease", "Mixed Document")
@@ -29,35 +35,87 @@ Provide analysis in JSON format with these fields:
 8. "legal_assessment": Overall legal assessment paragraph
 
 Be specific about legal issues and provide professional analysis."""
+ENFORCEABILITY_PROMPT_PREFIX = """As a legal expert, analyze this contract's enforceability:
+
+"""
+ENFORCEABILITY_PROMPT_SUFFIX = """
+
+Provide JSON analysis with:
+1. "enforceability_score": 0.0-1.0 score
+2. "enforceability_level": "High", "Moderate", "Low", or "Very Low"
+3. "essential_elements_present": List of present essential elements
+4. "missing_essential_elements": List of missing essential elements  
+5. "legal_issues": List of specific legal concerns
+6. "recommendations": List of recommendations to improve enforceability
+7. "summary": Brief enforceability summary
+
+Focus on: parties, consideration, legal capacity, legality, mutual assent."""
+FULL_ANALYSIS_PROMPT_PREFIX = """You are an expert legal document analyzer. Analyze this document's type and its enforceability.
+
+Document content:
+"""
+FULL_ANALYSIS_PROMPT_SUFFIX = """
+
+Provide analysis as a JSON object with two keys.
+
+"type_analysis", an object with these fields:
+1. "document_type": Primary document type (e.g., "Professional Services Agreement", "Commercial Lease", "Mixed Document")
+2. "confidence": Confidence score (0.0 to 1.0)
+3. "mixed_types": List of document types if mixed (empty array if not mixed)
+4. "key_characteristics": List of 3-5 key legal characteristics found
+5. "structural_issues": List of structural problems identified
+6. "missing_elements": List of essential elements that are missing
+7. "enforceability_concerns": List of enforceability issues
+8. "legal_assessment": Overall legal assessment paragraph
+
+"enforceability_analysis", an object with these fields:
+1. "enforceability_score": 0.0-1.0 score
+2. "enforceability_level": "High", "Moderate", "Low", or "Very Low"
+3. "essential_elements_present": List of present essential elements
+4. "missing_essential_elements": List of missing essential elements  
+5. "legal_issues": List of specific legal concerns
+6. "recommendations": List of recommendations to improve enforceability
+7. "summary": Brief enforceability summary
+
+For enforceability focus on: parties, consideration, legal capacity, legality, mutual assent.
+Be specific about legal issues and provide professional analysis."""
+
 
+class AnalysisMixin:
+    def _contract_type_messages(self, truncated_content: str) -> List[Dict[str, str]]:
+        prompt = "".join((CONTRACT_TYPE_PROMPT_PREFIX, truncated_content, CONTRACT_TYPE_PROMPT_SUFFIX))
+
+        return [
+            {"role": "system", "content": ANALYZER_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_contract_type_response(self, ai_response: str, truncated_content: str) -> Dict[str, Any]:
         try:
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert legal document analyzer with 20+ years of contract law experience. Provide detailed, professional analysis in valid JSON format only."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=self.temperature
-            )
-            
-            ai_response = response.choices[0].message.content.strip()
-            
-            try:
-                analysis = json.loads(ai_response)
-            except json.JSONDecodeError:
-                json_match = re.search(r'```json\s*(.*?)\s*```', ai_response, re.DOTALL)
-                if json_match:
-                    analysis = json.loads(json_match.group(1))
-                else:
-                    analysis = self._parse_ai_text_response(ai_response, truncated_content)
+            return orjson.loads(ai_response)
+        except orjson.JSONDecodeError:
+            json_match = re.search(r'```json\s*(.*?)\s*```', ai_response, re.DOTALL)
+            if json_match:
+                return orjson.loads(json_match.group(1))
+            return self._parse_ai_text_response(ai_response, truncated_content)
+
+    def analyze_contract_type(self, content: str) -> Dict[str, Any]:
+        if not self.openai_client:
+            return self._fallback_contract_analysis(content)
+        
+        prompt_text = normalize_prompt_text(content)
+        truncated_content = prompt_text[:self.max_context_length]
+
+        try:
+            ai_response = self._chat_completion(self._contract_type_messages(truncated_content), max_tokens=2000, json_response=True)
+            analysis = self._parse_contract_type_response(ai_response, truncated_content)
             
             return {
                 "analysis": analysis,
                 "success": True,
                 "ai_model": self.model,
                 "content_length": len(content),
-                "truncated": len(content) > self.max_context_length
+                "truncated": len(prompt_text) > self.max_context_length
             }
         except Exception as e:
             logger.error(f"AI contract analysis failed: {e}")
@@ -67,42 +125,27 @@ Be specific about legal issues and provide professional analysis."""
         if not self.openai_client:
             return {"enforceability": "Cannot analyze - AI service unavailable", "score": 0.0}
         
-        truncated_content = content[:self.max_context_length] if len(content) > self.max_context_length else content
+        prompt_text = normalize_prompt_text(content)
+        truncated_content = prompt_text[:self.max_context_length]
         
-        prompt = f"""As a legal expert, analyze this contract's enforceability:
-
-{truncated_content}
-
-Provide JSON analysis with:
-1. "enforceability_score": 0.0-1.0 score
-2. "enforceability_level": "High", "Moderate", "Low", or "Very Low"
-3. "essential_elements_present": List of present essential elements
-4. "missing_essential_elements": List of missing essential elements  
-5. "legal_issues": List of specific legal concerns
-6. "recommendations": List of recommendations to improve enforceability
-7. "summary": Brief enforceability summary
-
-Focus on: parties, consideration, legal capacity, legality, mutual assent."""
+        prompt = "".join((ENFORCEABILITY_PROMPT_PREFIX, truncated_content, ENFORCEABILITY_PROMPT_SUFFIX))
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a contract law expert. Analyze enforceability thoroughly and provide valid JSON only."},
+            ai_response = self._chat_completion(
+                [
+                    {"role": "system", "content": ENFORCEABILITY_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=1500,
-                temperature=self.temperature
+                json_response=True
             )
             
-            ai_response = response.choices[0].message.content.strip()
-            
             try:
-                analysis = json.loads(ai_response)
-            except json.JSONDecodeError:
+                analysis = orjson.loads(ai_response)
+            except orjson.JSONDecodeError:
                 json_match = re.search(r'```json\s*(.*?)\s*```', ai_response, re.DOTALL)
                 if json_match:
-                    analysis = json.loads(json_match.group(1))
+                    analysis = orjson.loads(json_match.group(1))
                 else:
                     analysis = {"summary": ai_response, "enforceability_score": 0.5}
             
@@ -114,3 +157,163 @@ Focus on: parties, consideration, legal capacity, legality, mutual assent."""
         except Exception as e:
             logger.error(f"AI enforceability analysis failed: {e}")
             return {"enforceability": f"Analysis failed: {e}", "score": 0.0}
+
+    def analyze_contract_full(self, content: str) -> Dict[str, Any]:
+        """Type and enforceability analysis from a single request.
+
+        Returns {"type_analysis": ..., "enforceability_analysis": ...} in the shapes of
+        analyze_contract_type and analyze_contract_enforceability; the document is sent
+        (and billed) once instead of twice.
+        """
+        if not self.openai_client:
+            return {
+                "type_analysis": self._fallback_contract_analysis(content),
+                "enforceability_analysis": {"enforceability": "Cannot analyze - AI service unavailable", "score": 0.0}
+            }
+        
+        prompt_text = normalize_prompt_text(content)
+        truncated_content = prompt_text[:self.max_context_length]
+        
+        prompt = "".join((FULL_ANALYSIS_PROMPT_PREFIX, truncated_content, FULL_ANALYSIS_PROMPT_SUFFIX))
+
+        try:
+            ai_response = self._chat_completion(
+                [
+                    {"role": "system", "content": ANALYZER_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=3000,
+                json_response=True
+            )
+            
+            try:
+                combined = orjson.loads(ai_response)
+            except orjson.JSONDecodeError:
+                json_match = re.search(r'```json\s*(.*?)\s*```', ai_response, re.DOTALL)
+                combined = orjson.loads(json_match.group(1)) if json_match else {}
+            
+            type_analysis = combined.get("type_analysis") or self._parse_ai_text_response(ai_response, truncated_content)
+            enforceability_analysis = combined.get("enforceability_analysis") or {"summary": ai_response, "enforceability_score": 0.5}
+            
+            return {
+                "type_analysis": {
+                    "analysis": type_analysis,
+                    "success": True,
+                    "ai_model": self.model,
+                    "content_length": len(content),
+                    "truncated": len(prompt_text) > self.max_context_length
+                },
+                "enforceability_analysis": {
+                    "analysis": enforceability_analysis,
+                    "success": True,
+                    "model": self.model
+                }
+            }
+        except Exception as e:
+            logger.error(f"AI combined contract analysis failed: {e}")
+            return {
+                "type_analysis": self._fallback_contract_analysis(content),
+                "enforceability_analysis": {"enforceability": f"Analysis failed: {e}", "score": 0.0}
+            }
+
+    # Async variants for request handlers. The blocking client call runs in a worker
+    # thread, so concurrent requests (and the calls inside analyze_full) overlap
+    # their network waits instead of stalling the event loop.
+    async def aanalyze_contract_type(self, content: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.analyze_contract_type, content)
+
+    async def aanalyze_contract_enforceability(self, content: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.analyze_contract_enforceability, content)
+
+    async def analyze_full(self, content: str, question: Optional[str] = None) -> Dict[str, Any]:
+        """Type and enforceability analysis, plus an answer to question if given, fetched concurrently"""
+        if question is None:
+            return await asyncio.to_thread(self.analyze_contract_full, content)
+        analyses, answer = await asyncio.gather(
+            asyncio.to_thread(self.analyze_contract_full, content),
+            self.aanswer_legal_question(question, content)
+        )
+        return {**analyses, "answer": answer}
+
+    def analyze_contracts_batch(self, contents: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Contract type analysis for many documents through the OpenAI Batch API.
+
+        For offline work (re-analysing a corpus, reports): the batch is billed at half
+        the synchronous rate and does not count against the interactive rate limits,
+        but completes within hours, not seconds. Blocks until the batch finishes or
+        timeout seconds pass; returns one analyze_contract_type-shaped result per
+        document, using the pattern-matching fallback for any that failed.
+        """
+        if not contents:
+            return []
+        if not self.openai_client:
+            return [self._fallback_contract_analysis(content) for content in contents]
+
+        prompt_texts = [normalize_prompt_text(content) for content in contents]
+        truncated = [prompt_text[:self.max_context_length] for prompt_text in prompt_texts]
+        requests = io.BytesIO()
+        for i, truncated_content in enumerate(truncated):
+            line = {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": self._contract_type_messages(truncated_content),
+                    "max_tokens": 2000,
+                    "temperature": self.temperature
+                }
+            }
+            response_format = self._response_format(True)
+            if response_format:
+                line["body"]["response_format"] = response_format
+            requests.write(orjson.dumps(line) + b"\n")
+
+        ai_responses: Dict[int, str] = {}
+        try:
+            batch_file = self.openai_client.files.create(file=("contracts.jsonl", requests.getvalue()), purpose="batch")
+            # Raw requests: the pinned client predates its batches resource
+            batch = self.openai_client.post("/batches", body={
+                "input_file_id": batch_file.id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h"
+            }, cast_to=httpx.Response).json()
+            logger.info(f"Submitted contract analysis batch {batch['id']} for {len(contents)} documents")
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"Batch {batch['id']} still {batch['status']} after {timeout}s")
+                time.sleep(BATCH_POLL_INTERVAL)
+                batch = self.openai_client.get(f"/batches/{batch['id']}", cast_to=httpx.Response).json()
+
+            if batch.get("output_file_id"):
+                output = self.openai_client.files.content(batch["output_file_id"]).text
+                for line in output.splitlines():
+                    record = orjson.loads(line)
+                    response = record.get("response") or {}
+                    if response.get("status_code") == 200:
+                        ai_responses[int(record["custom_id"])] = response["body"]["choices"][0]["message"]["content"].strip()
+            logger.info(f"Batch {batch['id']} {batch['status']}: {len(ai_responses)} of {len(contents)} analyses returned")
+        except Exception as e:
+            logger.error(f"AI batch contract analysis failed: {e}")
+
+        results = []
+        for i, content in enumerate(contents):
+            if i not in ai_responses:
+                results.append(self._fallback_contract_analysis(content))
+                continue
+            try:
+                analysis = self._parse_contract_type_response(ai_responses[i], truncated[i])
+            except Exception as e:
+                logger.error(f"Could not parse batch analysis {i}: {e}")
+                results.append(self._fallback_contract_analysis(content))
+                continue
+            results.append({
+                "analysis": analysis,
+                "success": True,
+                "ai_model": self.model,
+                "content_length": len(content),
+                "truncated": len(prompt_texts[i]) > self.max_context_length
+            })
+        return results
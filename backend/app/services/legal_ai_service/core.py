@@ -1,5 +1,9 @@
+import os
+import threading
 import openai
+import httpx
 import logging
+from collections import OrderedDict
 from app.core.config import settings
 
 from .analysis import AnalysisMixin
@@ -7,9 +11,26 @@ from .qa import QAMixin
 from .fallback import FallbackMixin
 from .utils import UtilsMixin
 from .health import HealthMixin
+from .rate_limit import RequestLimiter
 
 logger = logging.getLogger(__name__)
 
+# The client retries rate limits, 408/409/5xx responses, timeouts and dropped
+# connections itself, with exponential backoff that honours Retry-After. Three
+# attempts in all; a stalled read gives up after two minutes rather than the
+# default ten, so the retry (or the pattern-matching fallback) comes promptly
+OPENAI_MAX_RETRIES = 2
+OPENAI_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
+
+
+def _per_worker(limit):
+    """Share of an account-wide per-minute limit for this process"""
+    if not limit:
+        return None
+    # uvicorn and gunicorn both take their worker count from WEB_CONCURRENCY
+    workers = int(os.environ.get("WEB_CONCURRENCY") or 1)
+    return max(1, limit // max(1, workers))
+
 
 class LegalAIService(AnalysisMixin, QAMixin, FallbackMixin, UtilsMixin, HealthMixin):
     """
@@ -17,6 +38,14 @@ class LegalAIService(AnalysisMixin, QAMixin, FallbackMixin, UtilsMixin, HealthMi
     Combines all mixins into one unified service
     """
     def __init__(self):
+        # Completion text keyed by a request digest, most recent last
+        self._response_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        # Answered questions as (context digest, question) -> (embedding, terms, result)
+        self._semantic_cache = OrderedDict()
+        self._semantic_cache_lock = threading.Lock()
+        self._health_status = None
+        self._health_checked_at = 0.0
         try:
             api_key = getattr(settings, 'OPENAI_API_KEY', None)
             if not api_key:
@@ -24,10 +53,19 @@ class LegalAIService(AnalysisMixin, QAMixin, FallbackMixin, UtilsMixin, HealthMi
                 self.openai_client = None
                 return
 
-            self.openai_client = openai.OpenAI(api_key=api_key)
+            self.openai_client = openai.OpenAI(
+                api_key=api_key,
+                max_retries=OPENAI_MAX_RETRIES,
+                timeout=OPENAI_TIMEOUT
+            )
             self.model = getattr(settings, 'DEFAULT_AI_MODEL', 'gpt-4')
             self.max_context_length = getattr(settings, 'MAX_CONTEXT_LENGTH', 8000)
             self.temperature = getattr(settings, 'AI_TEMPERATURE', 0.1)
+            self._limiter = RequestLimiter(
+                max_concurrent=getattr(settings, 'OPENAI_MAX_CONCURRENT', 8),
+                requests_per_minute=_per_worker(getattr(settings, 'OPENAI_REQUESTS_PER_MINUTE', None)),
+                tokens_per_minute=_per_worker(getattr(settings, 'OPENAI_TOKENS_PER_MINUTE', None))
+            )
             logger.info(f"Legal AI Service initialized with model: {self.model}")
         except Exception as e:
             logger.error(f"Failed to initialize Legal AI Service: {e}")
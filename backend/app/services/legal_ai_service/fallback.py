@@ -1,17 +1,17 @@
 import logging
 from typing import Dict, Any
-from .legal_doc_analyzer import LegalDocumentAnalyzer
+from .legal_doc_analyzer import legal_document_analyzer
 
 logger = logging.getLogger(__name__)
 
 class FallbackMixin:
     def _fallback_contract_analysis(self, content: str) -> Dict[str, Any]:
         try:
-            legal_analyzer = LegalDocumentAnalyzer()
+            legal_analyzer = legal_document_analyzer
             
             doc_type_analysis = legal_analyzer.analyze_document_type(content)
             essential_elements = legal_analyzer.analyze_essential_elements(content)
-            enforceability_issues = legal_analyzer.analyze_enforceability_issues(content)
+            enforceability_issues = legal_analyzer.analyze_enforceability_issues(content, doc_type_analysis)
             
             analysis = {
                 "document_type": doc_type_analysis.get("document_type", "Unknown"),
@@ -49,11 +49,11 @@ class FallbackMixin:
 
     def _fallback_question_answering(self, question: str, context: str) -> Dict[str, Any]:
         try:
-            legal_analyzer = LegalDocumentAnalyzer()
+            legal_analyzer = legal_document_analyzer
             
             doc_type_analysis = legal_analyzer.analyze_document_type(context)
             essential_elements = legal_analyzer.analyze_essential_elements(context)
-            enforceability_issues = legal_analyzer.analyze_enforceability_issues(context)
+            enforceability_issues = legal_analyzer.analyze_enforceability_issues(context, doc_type_analysis)
             
             question_type = self._classify_question_type(question)
             
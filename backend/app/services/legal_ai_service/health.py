@@ -1,10 +1,23 @@
 import logging
+import time
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Seconds a probe result is reused; liveness checks and per-request status logs
+# would otherwise each make an API call
+HEALTH_CHECK_TTL = 30
+
 class HealthMixin:
     def health_check(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        if self._health_status is not None and now - self._health_checked_at < HEALTH_CHECK_TTL:
+            return dict(self._health_status)
+        status = self._check_health()
+        self._health_status, self._health_checked_at = status, now
+        return dict(status)
+
+    def _check_health(self) -> Dict[str, Any]:
         if not self.openai_client:
             return {
                 "status": "unhealthy",
@@ -13,11 +26,8 @@ class HealthMixin:
             }
         
         try:
-            test_response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "Test connection"}],
-                max_tokens=10
-            )
+            # Model metadata checks the key and model access without generating tokens
+            self.openai_client.models.retrieve(self.model)
             
             return {
                 "status": "healthy",
@@ -6,7 +6,7 @@ essential elements, and potential enforceability issues.
 
 import re
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -79,16 +79,31 @@ class LegalDocumentAnalyzer:
             ]
         }
 
+        self.enforceability_patterns = {
+            'parties': [r'between\s+[A-Z]', r'client:', r'service\s+provider:', r'landlord:', r'tenant:'],
+            'consideration': [r'\$\d', r'payment', r'rent', r'fee', r'compensation'],
+            'obligations': [r'shall', r'agrees?\s+to', r'responsible', r'obligated']
+        }
+
+        # Compiled once here; the analyze_* methods run per request
+        self._contract_patterns_compiled = self._compile_patterns(self.contract_patterns)
+        self._essential_elements_compiled = self._compile_patterns(self.essential_elements)
+        self._enforceability_compiled = self._compile_patterns(self.enforceability_patterns)
+
+    @staticmethod
+    def _compile_patterns(pattern_groups: Dict[str, List[str]]) -> Dict[str, List[re.Pattern]]:
+        return {name: [re.compile(p) for p in patterns] for name, patterns in pattern_groups.items()}
+
     def analyze_document_type(self, content: str) -> Dict[str, Any]:
         """Analyze document type using pattern matching"""
         content_lower = content.lower()
         type_scores = {}
         
-        for doc_type, patterns in self.contract_patterns.items():
+        for doc_type, patterns in self._contract_patterns_compiled.items():
             score = 0
             matches = []
             for pattern in patterns:
-                pattern_matches = re.findall(pattern, content_lower)
+                pattern_matches = pattern.findall(content_lower)
                 if pattern_matches:
                     score += len(pattern_matches)
                     matches.extend(pattern_matches)
@@ -123,10 +138,10 @@ class LegalDocumentAnalyzer:
         elements_found = {}
         missing_elements = []
         
-        for element_type, patterns in self.essential_elements.items():
+        for element_type, patterns in self._essential_elements_compiled.items():
             matches = []
             for pattern in patterns:
-                found = re.findall(pattern, content_lower)
+                found = pattern.findall(content_lower)
                 if found:
                     matches.extend(found[:2])
             
@@ -141,32 +156,38 @@ class LegalDocumentAnalyzer:
             'completeness_score': len(elements_found) / len(self.essential_elements)
         }
 
-    def analyze_enforceability_issues(self, content: str) -> List[str]:
-        """Identify potential enforceability issues"""
+    def analyze_enforceability_issues(self, content: str, doc_analysis: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Identify potential enforceability issues.
+
+        Callers that already ran analyze_document_type on this content can pass its
+        result as doc_analysis to skip a second type scan.
+        """
         issues = []
         content_lower = content.lower()
         
-        doc_analysis = self.analyze_document_type(content)
+        if doc_analysis is None:
+            doc_analysis = self.analyze_document_type(content)
         if len(doc_analysis.get('all_scores', {})) > 1:
             issues.append("Document contains elements of multiple agreement types which could create enforceability issues")
         
-        party_patterns = [r'between\s+[A-Z]', r'client:', r'service\s+provider:', r'landlord:', r'tenant:']
-        party_matches = sum(1 for pattern in party_patterns if re.search(pattern, content_lower))
+        party_matches = sum(1 for pattern in self._enforceability_compiled['parties'] if pattern.search(content_lower))
         
         if party_matches == 0:
             issues.append("No clearly identified parties found - essential for enforceability")
         elif party_matches == 1:
             issues.append("Only one party clearly identified - contracts require at least two parties")
         
-        consideration_patterns = [r'\$\d', r'payment', r'rent', r'fee', r'compensation']
-        if not any(re.search(pattern, content_lower) for pattern in consideration_patterns):
+        if not any(pattern.search(content_lower) for pattern in self._enforceability_compiled['consideration']):
             issues.append("No consideration (payment/exchange of value) clearly identified")
         
-        obligation_patterns = [r'shall', r'agrees?\s+to', r'responsible', r'obligated']
-        if not any(re.search(pattern, content_lower) for pattern in obligation_patterns):
+        if not any(pattern.search(content_lower) for pattern in self._enforceability_compiled['obligations']):
             issues.append("No clear obligations or duties specified")
         
         if len(content.strip()) < 200:
             issues.append("Document appears too brief for a comprehensive legal agreement")
         
         return issues
+
+
+# Shared instance, so the patterns are compiled once per process
+legal_document_analyzer = LegalDocumentAnalyzer()
@@ -1,21 +1,45 @@
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any
+import re
+from typing import Callable, Dict, Any, Optional
+import numpy as np
+from app.services.embedding import embedding_service
+from app.services.embedding.errors import EmbeddingError
+from .utils import normalize_prompt_text
 
 logger = logging.getLogger(__name__)
 
-class QAMixin:
-    def answer_legal_question(self, question: str, context: str) -> Dict[str, Any]:
-        if not self.openai_client:
-            return self._fallback_question_answering(question, context)
-        
-        truncated_context = context[:self.max_context_length] if len(context) > self.max_context_length else context
-        
-        prompt = f"""You are an expert legal analyst. Based on the following legal document, provide a comprehensive answer to the user's question.
+SEMANTIC_CACHE_SIZE = 128
+# Cosine similarity above which two questions about the same document are candidates
+# to share an answer. Not calibrated on the local encoder, whose mean-pooled vectors
+# score role-swapped questions this high too, so a hit must also pass the term check below
+SEMANTIC_CACHE_THRESHOLD = 0.93
+
+QUESTION_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Phrasing that varies between paraphrases without changing what is asked
+QUESTION_FILLER_WORDS = frozenset((
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "do", "does", "did",
+    "can", "could", "may", "might", "will", "would", "shall", "should", "must",
+    "there", "this", "that", "these", "those", "it", "its", "of", "in", "on", "for",
+    "to", "by", "with", "and", "or", "any", "me", "tell", "please", "document",
+    "contract", "agreement"
+))
+# Always part of what is asked, whether or not the document uses them: "when must the
+# tenant pay rent?" and "how must the tenant pay rent?" want different answers
+NEGATION_WORDS = frozenset(("not", "no", "never", "without", "cannot", "nor", "none"))
+INTERROGATIVE_WORDS = frozenset(("what", "who", "whom", "whose", "which", "when", "where", "why", "how"))
+
+# Fixed prompt text around the document and question, built once at import rather than per call
+QA_SYSTEM_PROMPT = "You are an expert legal analyst providing detailed document analysis. Be precise, professional, and cite specific document sections when possible."
+QA_PROMPT_PREFIX = """You are an expert legal analyst. Based on the following legal document, provide a comprehensive answer to the user's question.
 
 Document content:
-{truncated_context}
+"""
+QA_PROMPT_QUESTION = """
 
-Question: {question}
+Question: """
+QA_PROMPT_SUFFIX = """
 
 Provide a detailed legal analysis addressing:
 1. Direct answer to the question
@@ -26,26 +50,119 @@ Provide a detailed legal analysis addressing:
 
 Be specific, cite relevant document parts, and provide professional legal analysis."""
 
+class QAMixin:
+    def _question_embedding(self, question: str) -> Optional[np.ndarray]:
+        """Unit-length embedding of a question from the local model, or None if it is unavailable"""
+        try:
+            return embedding_service._generate_local_embedding(question)
+        except EmbeddingError as e:
+            logger.debug(f"Semantic QA cache skipped: {e}")
+            return None
+
+    def _question_terms(self, question: str, context_words: frozenset) -> frozenset:
+        """Words of a question that pick out what it asks: document terms, interrogatives and negations.
+
+        Two questions only share an answer when these match, so "can the tenant terminate
+        early?" never reuses the answer to "can the landlord terminate early?" however
+        close their embeddings are, while "what parties" still matches "what are the parties?".
+        """
+        words = QUESTION_WORD_PATTERN.findall(question.lower().replace("n't", " not"))
+        return frozenset(
+            word for word in words
+            if word in NEGATION_WORDS or word in INTERROGATIVE_WORDS
+            or (word in context_words and word not in QUESTION_FILLER_WORDS)
+        )
+
+    def _semantic_cache_get(self, context_key: bytes, embedding: np.ndarray, terms: frozenset) -> Optional[Dict[str, Any]]:
+        """Answer to the closest equivalent earlier question on the same context, if close enough"""
+        with self._semantic_cache_lock:
+            best_key, best_score = None, SEMANTIC_CACHE_THRESHOLD
+            for key, (cached_embedding, cached_terms, _) in self._semantic_cache.items():
+                if key[0] != context_key or cached_terms != terms:
+                    continue
+                # Embeddings are L2-normalised, so the dot product is the cosine similarity
+                score = float(np.dot(cached_embedding, embedding))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None
+            self._semantic_cache.move_to_end(best_key)
+            return dict(self._semantic_cache[best_key][2])
+
+    def _semantic_cache_put(
+        self,
+        context_key: bytes,
+        question: str,
+        embedding: np.ndarray,
+        terms: frozenset,
+        result: Dict[str, Any]
+    ) -> None:
+        key = (context_key, question.strip().lower())
+        with self._semantic_cache_lock:
+            self._semantic_cache[key] = (embedding, terms, dict(result))
+            self._semantic_cache.move_to_end(key)
+            while len(self._semantic_cache) > SEMANTIC_CACHE_SIZE:
+                self._semantic_cache.popitem(last=False)
+
+    def answer_legal_question(
+        self,
+        question: str,
+        context: str,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """Answer a question about a document; on_token, if given, receives the answer text as it streams in"""
+        if not self.openai_client:
+            return self._fallback_question_answering(question, context)
+        
+        prompt_text = normalize_prompt_text(context)
+        truncated_context = prompt_text[:self.max_context_length]
+
+        # Paraphrases of an earlier question on the same document reuse its answer
+        # instead of another GPT call; embedding a question locally is far cheaper
+        context_key = hashlib.blake2b(truncated_context.encode("utf-8"), digest_size=16).digest()
+        question_embedding = self._question_embedding(question)
+        if question_embedding is not None:
+            context_words = frozenset(QUESTION_WORD_PATTERN.findall(truncated_context.lower()))
+            question_terms = self._question_terms(question, context_words)
+            cached = self._semantic_cache_get(context_key, question_embedding, question_terms)
+            if cached is not None:
+                cached["source"] = "Semantic Cache"
+                cached["question_type"] = self._classify_question_type(question)
+                if on_token:
+                    on_token(cached["answer"])
+                return cached
+        
+        prompt = "".join((QA_PROMPT_PREFIX, truncated_context, QA_PROMPT_QUESTION, question, QA_PROMPT_SUFFIX))
+
         try:
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert legal analyst providing detailed document analysis. Be precise, professional, and cite specific document sections when possible."},
+            ai_answer = self._chat_completion(
+                [
+                    {"role": "system", "content": QA_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=2500,
-                temperature=self.temperature
+                on_token=on_token
             )
             
-            ai_answer = response.choices[0].message.content.strip()
-            
-            return {
+            result = {
                 "answer": ai_answer,
                 "confidence": 0.95,
                 "source": "AI Legal Analysis",
                 "model": self.model,
                 "question_type": self._classify_question_type(question)
             }
+            if question_embedding is not None:
+                self._semantic_cache_put(context_key, question, question_embedding, question_terms, result)
+            return result
         except Exception as e:
             logger.error(f"AI question answering failed: {e}")
             return self._fallback_question_answering(question, context)
+
+    async def aanswer_legal_question(
+        self,
+        question: str,
+        context: str,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """answer_legal_question without blocking the event loop; on_token runs in the worker thread"""
+        return await asyncio.to_thread(self.answer_legal_question, question, context, on_token)
@@ -0,0 +1,66 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+class RequestLimiter:
+    """
+    Caps concurrent OpenAI requests and paces them under per-minute request and
+    token budgets, so a burst queues here instead of thrashing on 429 retries.
+    Budgets refill continuously (token bucket); a budget of None is not paced.
+    Waiting blocks the calling thread; the async handlers reach the client through
+    worker threads (asyncio.to_thread), never on the event loop itself.
+    """
+    def __init__(
+        self,
+        max_concurrent: int,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._requests_per_minute = requests_per_minute
+        self._tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute or 0)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        if self._requests_per_minute:
+            self._requests = min(self._requests_per_minute, self._requests + elapsed * self._requests_per_minute / 60)
+        if self._tokens_per_minute:
+            self._tokens = min(self._tokens_per_minute, self._tokens + elapsed * self._tokens_per_minute / 60)
+        self._updated = now
+
+    def _take_budget(self, tokens: int) -> None:
+        if not self._requests_per_minute and not self._tokens_per_minute:
+            return
+        if self._tokens_per_minute:
+            # A request larger than the whole per-minute budget waits for a full bucket
+            tokens = min(tokens, self._tokens_per_minute)
+        while True:
+            with self._lock:
+                self._refill()
+                requests_ok = not self._requests_per_minute or self._requests >= 1
+                tokens_ok = not self._tokens_per_minute or self._tokens >= tokens
+                if requests_ok and tokens_ok:
+                    if self._requests_per_minute:
+                        self._requests -= 1
+                    if self._tokens_per_minute:
+                        self._tokens -= tokens
+                    return
+                wait = max(
+                    0 if requests_ok else (1 - self._requests) * 60 / self._requests_per_minute,
+                    0 if tokens_ok else (tokens - self._tokens) * 60 / self._tokens_per_minute
+                )
+            time.sleep(wait)
+
+    @contextmanager
+    def request(self, estimated_tokens: int):
+        """Hold a request slot, after waiting for budget, for the duration of the block"""
+        self._take_budget(estimated_tokens)
+        with self._slots:
+            yield
@@ -1,23 +1,129 @@
-from typing import Dict, Any
+import hashlib
+import re
+import orjson
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional
+
+RESPONSE_CACHE_SIZE = 256
+# Models that accept response_format={"type": "json_object"}; the original gpt-4
+# snapshots reject it, so their replies still go through the lenient parsing
+JSON_MODE_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-3.5-turbo")
+
+HORIZONTAL_SPACE_PATTERN = re.compile(r"[^\S\n]+")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+# (question type, phrases) in priority order; the first type with a phrase in the question wins
+QUESTION_TYPE_PHRASES = (
+    ("document_classification", ('what type', 'contract type', 'document type')),
+    ("enforceability_analysis", ('enforceable', 'enforceability', 'legally valid')),
+    ("party_identification", ('parties', 'who are', 'between whom')),
+    ("completeness_analysis", ('missing', 'what is missing', 'incomplete')),
+    ("financial_terms", ('cost', 'price', 'rent', 'payment', 'fee')),
+    ("confidentiality_analysis", ('confidential', 'nda', 'disclosure'))
+)
+
+
+def normalize_prompt_text(text: str) -> str:
+    """Collapse whitespace runs that only cost tokens, keeping line and paragraph breaks.
+
+    Extracted PDF and DOCX text is padded with spaces and blank lines; squeezing them
+    fits more of the document into the context window, and copies of a document that
+    differ only in layout produce the same prompt (and so share cached responses).
+    """
+    lines = (HORIZONTAL_SPACE_PATTERN.sub(" ", line).strip() for line in text.split("\n"))
+    return BLANK_LINES_PATTERN.sub("\n\n", "\n".join(lines)).strip()
+
+
+@lru_cache(maxsize=1024)
+def _classify_question(question_lower: str) -> str:
+    """Question type for a lowercased question; repeated chat questions hit the cache"""
+    for question_type, phrases in QUESTION_TYPE_PHRASES:
+        if any(phrase in question_lower for phrase in phrases):
+            return question_type
+    return "general_legal_question"
+
 
 class UtilsMixin:
+    def _response_format(self, json_response: bool) -> Optional[Dict[str, str]]:
+        """JSON mode for the configured model when a JSON reply is wanted and supported"""
+        if json_response and self.model.startswith(JSON_MODE_MODEL_PREFIXES):
+            return {"type": "json_object"}
+        return None
+
+    def _chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        json_response: bool = False,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Text of a chat completion, reusing the answer to an identical earlier request.
+
+        With on_token the reply is streamed and each text fragment is passed to it as it
+        arrives (a cached reply arrives as one fragment); the full text is still returned.
+        """
+        request_options = {"max_tokens": max_tokens, "temperature": self.temperature}
+        response_format = self._response_format(json_response)
+        if response_format:
+            request_options["response_format"] = response_format
+
+        # At the configured low temperature the same request gets the same answer,
+        # so repeat analyses of a document cost nothing
+        request = orjson.dumps([self.model, request_options, messages])
+        cache_key = hashlib.blake2b(request, digest_size=16).digest()
+        # The lock covers cache access only, never the API call: analyze_full runs
+        # completions in several threads at once
+        with self._response_cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+        if cached is not None:
+            if on_token:
+                on_token(cached)
+            return cached
+
+        # Rough prompt size (~4 characters per token) plus the completion allowance,
+        # which OpenAI also counts against the per-minute token limit
+        estimated_tokens = sum(len(message["content"]) for message in messages) // 4 + max_tokens
+        with self._limiter.request(estimated_tokens):
+            ai_response = self._request_completion(messages, request_options, on_token)
+
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = ai_response
+            while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return ai_response
+
+    def _request_completion(
+        self,
+        messages: List[Dict[str, str]],
+        request_options: Dict[str, Any],
+        on_token: Optional[Callable[[str], None]]
+    ) -> str:
+        if on_token:
+            stream = self.openai_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                stream=True,
+                **request_options
+            )
+            fragments = []
+            for chunk in stream:
+                fragment = chunk.choices[0].delta.content if chunk.choices else None
+                if fragment:
+                    fragments.append(fragment)
+                    on_token(fragment)
+            return "".join(fragments).strip()
+
+        response = self.openai_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            **request_options
+        )
+        return response.choices[0].message.content.strip()
+
     def _classify_question_type(self, question: str) -> str:
-        question_lower = question.lower()
-        
-        if any(phrase in question_lower for phrase in ['what type', 'contract type', 'document type']):
-            return "document_classification"
-        elif any(phrase in question_lower for phrase in ['enforceable', 'enforceability', 'legally valid']):
-            return "enforceability_analysis"
-        elif any(phrase in question_lower for phrase in ['parties', 'who are', 'between whom']):
-            return "party_identification"
-        elif any(phrase in question_lower for phrase in ['missing', 'what is missing', 'incomplete']):
-            return "completeness_analysis"
-        elif any(phrase in question_lower for phrase in ['cost', 'price', 'rent', 'payment', 'fee']):
-            return "financial_terms"
-        elif any(phrase in question_lower for phrase in ['confidential', 'nda', 'disclosure']):
-            return "confidentiality_analysis"
-        else:
-            return "general_legal_question"
+        return _classify_question(question.lower())
 
     def _parse_ai_text_response(self, ai_response: str, content: str) -> Dict[str, Any]:
         analysis = {
@@ -67,7 +67,7 @@ class ContextManager:
             if document and document.content:
                 # Analyze with AI when loading
                 try:
-                    ai_analysis = legal_ai_service.analyze_contract_type(document.content)
+                    ai_analysis = await legal_ai_service.aanalyze_contract_type(document.content)
                     if ai_analysis.get("success"):
                         analysis_data = ai_analysis["analysis"]
                     else:
@@ -158,7 +158,7 @@ class ContextManager:
                 
                 # Analyze document when selecting
                 try:
-                    ai_analysis = legal_ai_service.analyze_contract_type(best_match.content)
+                    ai_analysis = await legal_ai_service.aanalyze_contract_type(best_match.content)
                     if ai_analysis.get("success"):
                         analysis_data = ai_analysis["analysis"]
                     else:
@@ -2,6 +2,7 @@
 Main QA service orchestration
 """
 from datetime import datetime
+import asyncio
 import logging
 from typing import Dict, List, Optional, Any
 from .models import PipelineManager
@@ -64,7 +65,7 @@ class QuestionAnsweringService:
                 }
             
             # Select and run QA pipeline (now prioritizes AI)
-            qa_pipeline, model_type = self.pipeline_manager.select_qa_pipeline(question, context)
+            qa_pipeline, model_type = await asyncio.to_thread(self.pipeline_manager.select_qa_pipeline, question, context)
             
             # Truncate context if too long
             max_context_length = getattr(settings, 'MAX_CONTEXT_LENGTH', 8000)
@@ -72,7 +73,7 @@ class QuestionAnsweringService:
                 context = context[:max_context_length]
             
             # Run QA
-            result = self.pipeline_manager.run_qa_pipeline(qa_pipeline, question, context, model_type)
+            result = await asyncio.to_thread(self.pipeline_manager.run_qa_pipeline, qa_pipeline, question, context, model_type)
             
             # Extract and enhance answer
             answer = result.get("answer", "No answer found")
@@ -150,7 +151,7 @@ async def answer_question_with_context(question: str, context: str, document_id:
             }
         
         # Try AI first for legal questions
-        qa_pipeline, model_type = qa_service.pipeline_manager.select_qa_pipeline(question, context)
+        qa_pipeline, model_type = await asyncio.to_thread(qa_service.pipeline_manager.select_qa_pipeline, question, context)
         
         # Truncate context if too long
         max_context_length = getattr(settings, 'MAX_CONTEXT_LENGTH', 8000)
@@ -158,7 +159,7 @@ async def answer_question_with_context(question: str, context: str, document_id:
             context = context[:max_context_length]
         
         # Run QA using AI-enhanced pipeline
-        result = qa_service.pipeline_manager.run_qa_pipeline(qa_pipeline, question, context, model_type)
+        result = await asyncio.to_thread(qa_service.pipeline_manager.run_qa_pipeline, qa_pipeline, question, context, model_type)
         
         # Extract and enhance the answer
         answer = result.get("answer", "No answer found")
@@ -171,7 +172,7 @@ async def answer_question_with_context(question: str, context: str, document_id:
         metadata = {"model_type": model_type}
         if model_type == "legal_ai":
             try:
-                ai_analysis = legal_ai_service.analyze_contract_type(context)
+                ai_analysis = await legal_ai_service.aanalyze_contract_type(context)
                 if ai_analysis.get("success"):
                     metadata["document_analysis"] = ai_analysis["analysis"]
             except Exception as e:
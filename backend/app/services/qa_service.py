@@ -4,6 +4,7 @@ Structural issues resolved - all code properly organized in classes/functions
 """
 
 from datetime import datetime
+import asyncio
 import logging
 from pathlib import Path
 from transformers import AutoModelForQuestionAnswering, AutoTokenizer, pipeline
@@ -411,7 +412,7 @@ class QuestionAnsweringService:
             if document and document.content:
                 # NEW: Analyze with AI when loading
                 try:
-                    ai_analysis = legal_ai_service.analyze_contract_type(document.content)
+                    ai_analysis = await legal_ai_service.aanalyze_contract_type(document.content)
                     if ai_analysis.get("success"):
                         analysis_data = ai_analysis["analysis"]
                     else:
@@ -502,7 +503,7 @@ class QuestionAnsweringService:
                 
                 # Analyze document when selecting
                 try:
-                    ai_analysis = legal_ai_service.analyze_contract_type(best_match.content)
+                    ai_analysis = await legal_ai_service.aanalyze_contract_type(best_match.content)
                     if ai_analysis.get("success"):
                         analysis_data = ai_analysis["analysis"]
                     else:
@@ -736,7 +737,7 @@ class QuestionAnsweringService:
                 }
             
             # Select and run QA pipeline (now prioritizes AI)
-            qa_pipeline, model_type = self._select_qa_pipeline(question, context)
+            qa_pipeline, model_type = await asyncio.to_thread(self._select_qa_pipeline, question, context)
             
             # Truncate context if too long
             max_context_length = getattr(settings, 'MAX_CONTEXT_LENGTH', 8000)
@@ -744,7 +745,7 @@ class QuestionAnsweringService:
                 context = context[:max_context_length]
             
             # Run QA
-            result = self._run_qa_pipeline(qa_pipeline, question, context, model_type)
+            result = await asyncio.to_thread(self._run_qa_pipeline, qa_pipeline, question, context, model_type)
             
             # Extract and enhance answer
             answer = result.get("answer", "No answer found")
@@ -847,7 +848,7 @@ async def answer_question_with_context(question: str, context: str, document_id:
             }
         
         #  Try AI first for legal questions
-        qa_pipeline, model_type = qa_service._select_qa_pipeline(question, context)
+        qa_pipeline, model_type = await asyncio.to_thread(qa_service._select_qa_pipeline, question, context)
         
         # Truncate context if too long
         max_context_length = getattr(settings, 'MAX_CONTEXT_LENGTH', 8000)
@@ -855,7 +856,7 @@ async def answer_question_with_context(question: str, context: str, document_id:
             context = context[:max_context_length]
         
         # Run QA using AI-enhanced pipeline
-        result = qa_service._run_qa_pipeline(qa_pipeline, question, context, model_type)
+        result = await asyncio.to_thread(qa_service._run_qa_pipeline, qa_pipeline, question, context, model_type)
         
         # Extract and enhance the answer
         answer = result.get("answer", "No answer found")
@@ -868,7 +869,7 @@ async def answer_question_with_context(question: str, context: str, document_id:
         metadata = {"model_type": model_type}
         if model_type == "legal_ai":
             try:
-                ai_analysis = legal_ai_service.analyze_contract_type(context)
+                ai_analysis = await legal_ai_service.aanalyze_contract_type(context)
                 if ai_analysis.get("success"):
                     metadata["document_analysis"] = ai_analysis["analysis"]
             except Exception as e:
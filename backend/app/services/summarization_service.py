@@ -132,7 +132,6 @@ class ModelHandler:
     def _load_local_model(self):
         """Load the local summarization model."""
         try:
-            torch.set_num_threads(1)
             os.environ["CUDA_VISIBLE_DEVICES"]
 
 
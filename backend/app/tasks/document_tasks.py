@@ -331,7 +331,7 @@ async def _process_document_async(document_id: str, user_id: str, task_self) ->
             analysis_service = DocumentAnalysisService()
             
             # Extract clauses using the same logic as the analysis endpoint
-            clause_overview = analysis_service._extract_clauses(content)
+            clause_overview = analysis_service._extract_clauses(content, content.lower())
             logger.info(f"Extracted {len(clause_overview)} clauses for document {document_id}")
             
         except Exception as e:
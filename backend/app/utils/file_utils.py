@@ -8,12 +8,16 @@ import os
 
 # --- Async helper for FastAPI file upload ---
 async def parse_file_content(file: UploadFile) -> Union[str, None]:
-    filename = file.filename.lower()
-    ext = os.path.splitext(filename)[-1]
-
     content = await file.read()
+    return extract_text_from_bytes(file.filename, content)
+
+
+# --- For uploads already read into memory (sync) ---
+def extract_text_from_bytes(filename: str, content: bytes) -> Union[str, None]:
+    ext = os.path.splitext(filename.lower())[-1]
+
     if not content:
-        raise ValueError(f"Uploaded file {file.filename} is empty.")
+        raise ValueError(f"Uploaded file {filename} is empty.")
 
     if ext == ".pdf":
         return extract_from_pdf_bytes(content)
@@ -22,7 +26,7 @@ async def parse_file_content(file: UploadFile) -> Union[str, None]:
     elif ext == ".txt":
         return content.decode("utf-8", errors="ignore").strip()
     else:
-        raise ValueError(f"Unsupported file type: {file.filename}")
+        raise ValueError(f"Unsupported file type: {filename}")
 
 
 # --- For use with file paths (sync) ---
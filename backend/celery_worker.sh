@@ -18,8 +18,11 @@ if ! command -v celery &> /dev/null; then
   pip install -r requirements.txt
 fi
 
+# Exported so the torch thread pools are split across the same number of children
+export CELERY_CONCURRENCY="${CELERY_CONCURRENCY:-4}"
+
 # Start Celery worker with `document` queue
 exec celery -A app.core.tasks.celery_app worker \
   --loglevel=info \
-  --concurrency="${CELERY_CONCURRENCY:-4}" \
+  --concurrency="$CELERY_CONCURRENCY" \
   -Q document
@@ -112,10 +112,12 @@ except Exception as e:
 
 # Worker configuration
 if [ "$ENVIRONMENT" = "production" ]; then
-    WORKER_ARGS="--loglevel=$LOG_LEVEL --concurrency=2 --max-tasks-per-child=50 --time-limit=900"
+    export CELERY_CONCURRENCY=2
+    WORKER_ARGS="--loglevel=$LOG_LEVEL --concurrency=$CELERY_CONCURRENCY --max-tasks-per-child=50 --time-limit=900"
     echo "Production mode: Limited concurrency and task recycling enabled"
 else
-    WORKER_ARGS="--loglevel=$LOG_LEVEL --concurrency=1 --max-tasks-per-child=20"
+    export CELERY_CONCURRENCY=1
+    WORKER_ARGS="--loglevel=$LOG_LEVEL --concurrency=$CELERY_CONCURRENCY --max-tasks-per-child=20"
     echo "Development mode: Single worker process"
 fi
 